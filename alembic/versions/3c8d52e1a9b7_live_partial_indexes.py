@@ -0,0 +1,58 @@
+"""live partial indexes
+
+Revision ID: 3c8d52e1a9b7
+Revises: 2f44cc7d22ac
+Create Date: 2026-10-18 10:12:31.418205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8d52e1a9b7"
+down_revision: Union[str, None] = "2f44cc7d22ac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partial indexes of the rows that are not soft deleted (core.models.live_index)
+LIVE_INDEXES = [
+    ("user", "email"),
+    ("page", "slug"),
+    ("post", "slug"),
+    ("navigation", "slug"),
+    ("navigationitem", "slug"),
+    ("upload", "owner_id"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    where = sa.text("is_deleted = false")
+    # CONCURRENTLY does not lock the tables against writes, it cannot run in the
+    # migration transaction
+    with op.get_context().autocommit_block():
+        for table, column in LIVE_INDEXES:
+            op.create_index(
+                f"ix_{table}_{column}_live",
+                table,
+                [column],
+                unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                sqlite_where=where,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, column in LIVE_INDEXES:
+            op.drop_index(
+                f"ix_{table}_{column}_live",
+                table_name=table,
+                postgresql_concurrently=True,
+            )
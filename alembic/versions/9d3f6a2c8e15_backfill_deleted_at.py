@@ -0,0 +1,41 @@
+"""backfill deleted_at
+
+Revision ID: 9d3f6a2c8e15
+Revises: 5e2b7f9d41c3
+Create Date: 2026-10-18 18:05:42.630917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d3f6a2c8e15"
+down_revision: Union[str, None] = "5e2b7f9d41c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Soft delete tables (core.purge.purgeable_tables)
+SOFT_DELETE_TABLES = ["user", "page", "post", "navigation", "navigationitem", "upload"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows soft deleted without a deletion time were never purged, the last
+    # update is the closest time available
+    for table in SOFT_DELETE_TABLES:
+        op.execute(
+            sa.text(
+                f'UPDATE "{table}" SET deleted_at = updated_at '
+                "WHERE is_deleted AND deleted_at IS NULL"
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The backfilled times cannot be told apart from the real ones
+    pass
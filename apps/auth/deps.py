@@ -1,12 +1,20 @@
 # apps/auth/deps.py
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from core.security import get_jwt
+from apps.auth.revocation import get_revocations
 from apps.users.models import User
-from core.security.exceptions import ExpiredTokenException
-from core.security.jwt import TokenUser
+from apps.users.services import UserService
+from core.security.exceptions import (
+    ExpiredTokenException,
+    InvalidTokenException,
+    InvalidTokenTypeException,
+)
+from core.security.claims import Claims
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
+from core.database import get_async_sessionmaker
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
@@ -24,29 +32,46 @@ and they can return HTTPExceptions.
 # ------------------------------------------
 
 
-async def _get_token_data(token: str = Depends(oauth2_scheme)) -> TokenUser:
-    """Parse the token and return the payload."""
+async def _get_token_data(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    session_factory: async_sessionmaker = Depends(get_async_sessionmaker),
+) -> Claims:
+    """Verify the access token, check it is not revoked and return its claims.
+    FastAPI resolves it once per request, the claims are also shared with the code
+    outside the dependencies (middlewares, handlers) as `request.state.claims`.
+    """
     try:
-        _jwt = get_jwt()
-        token_user = _jwt.token_data(token)
-        return token_user
+        token_user = get_jwt().decode_typed(token, "access")
     except ExpiredTokenException:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except ValueError:
+    except (InvalidTokenException, InvalidTokenTypeException):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # In memory for the tokens not revoked, no session is opened
+    revocations = get_revocations()
+    if revocations.might_be_revoked(token_user.jti):
+        async with session_factory() as session:
+            if await revocations.is_revoked(token_user.jti, session):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token has been revoked",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+    request.state.claims = token_user
+    return token_user
 
 
 async def active_user_token(
-    token_user: TokenUser = Depends(_get_token_data),
-) -> TokenUser:
+    token_user: Claims = Depends(_get_token_data),
+) -> Claims:
     """Check if the user is active and also user is not deleted"""
     if not token_user.is_active:
         raise HTTPException(
@@ -58,8 +83,8 @@ async def active_user_token(
 
 
 async def staff_user_token(
-    token_user: TokenUser = Depends(active_user_token),
-) -> TokenUser:
+    token_user: Claims = Depends(active_user_token),
+) -> Claims:
     """Check if the user is staff."""
     if not token_user.is_staff:
         raise HTTPException(
@@ -70,8 +95,8 @@ async def staff_user_token(
 
 
 async def admin_user_token(
-    token_user: TokenUser = Depends(active_user_token),
-) -> TokenUser:
+    token_user: Claims = Depends(active_user_token),
+) -> Claims:
     """Check if the user is admin."""
     if not token_user.is_admin:
         raise HTTPException(
@@ -91,8 +116,10 @@ async def admin_user_token(
 
 async def get_user_or_401(user_id: str, session: AsyncSession) -> User:
     """Get user from DB or raise 401."""
-    user_db = await session.get(User, user_id)
-    if not user_db or user_db.is_deleted:
+    # Served from the identity cache of the users most of the time, soft deleted
+    # users are not found
+    user_db = await UserService(session=session).get_by_id(user_id)
+    if not user_db:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
@@ -102,16 +129,16 @@ async def get_user_or_401(user_id: str, session: AsyncSession) -> User:
     return user_db
 
 
-async def active_user(session: AsyncSession, token_user: TokenUser) -> User:
+async def active_user(session: AsyncSession, token_user: Claims) -> User:
     """Check if the user is active."""
     return await get_user_or_401(token_user.id, session)
 
 
-async def staff_user(session: AsyncSession, token_user: TokenUser) -> User:
+async def staff_user(session: AsyncSession, token_user: Claims) -> User:
     """Check if the user is staff."""
     return await get_user_or_401(token_user.id, session)
 
 
-async def admin_user(session: AsyncSession, token_user: TokenUser) -> User:
+async def admin_user(session: AsyncSession, token_user: Claims) -> User:
     """Check if the user is admin."""
     return await get_user_or_401(token_user.id, session)
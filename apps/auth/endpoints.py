@@ -1,6 +1,10 @@
 # apps/auth/endpoints.py
 
-from fastapi import APIRouter, Form
+import hashlib
+import json
+import time
+
+from fastapi import APIRouter, Form, Request, Response
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import EmailStr, BaseModel
@@ -13,12 +17,20 @@ from apps.auth.exceptions import (
     InvalidRefreshTokenException,
 )
 from apps.auth.schemas import LoginRequest
-from core.security.exceptions import InvalidTokenException, ExpiredTokenException
+from core.security.exceptions import (
+    InvalidTokenException,
+    ExpiredTokenException,
+    InvalidTokenTypeException,
+)
+from core.cache import LRUCache
+from core.security import get_jwt
 from core.security.jwt import TokenPair
 from apps.auth.services import AuthService
-from core.database import AsyncSession, get_session
+from core.database import AsyncSession, SessionRoute, get_session, get_uow_session
 
-router = APIRouter(tags=["auth"])
+router = APIRouter(tags=["auth"], route_class=SessionRoute)
+# Mounted at the root of the app
+well_known_router = APIRouter(tags=["auth"], route_class=SessionRoute)
 
 
 # ------------------------------------------
@@ -107,24 +119,62 @@ class MessageResponse(BaseModel):
 
 
 @router.get("/verify", response_model=MessageResponse)
-async def verify_email(token: str, session: AsyncSession = Depends(get_session)):
+async def verify_email(token: str, session: AsyncSession = Depends(get_uow_session)):
     auth_service = AuthService(session=session)
     try:
-        if not auth_service.jwt.verify(token, token_type="verification"):
-            raise HTTPException(status_code=401, detail="Invalid verification token")
-    except InvalidTokenException:
+        data = auth_service.jwt.decode_typed(token, "verification")
+    except (InvalidTokenException, InvalidTokenTypeException):
         raise HTTPException(status_code=401, detail="Invalid verification token")
     except ExpiredTokenException:
         raise HTTPException(status_code=401, detail="Verification token expired")
 
-    data = auth_service.jwt.token_data(token=token)
     user = await auth_service.user_service.get_by_id(data.id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.is_verified = True
-    session.add(user)
-    await session.commit()
-    await session.refresh(user)
+    await auth_service.user_service.update(user, {"is_verified": True})
 
     return {"message": "Email verified successfully"}
+
+
+# ------------------------------------------
+# POST /auth/revoke
+# Revoke an access or refresh token (RFC 7009)
+# Use Form(...) / application/x-www-form-urlencoded
+# ------------------------------------------
+@router.post("/revoke", response_model=MessageResponse)
+async def revoke_token(
+    token: str = Form(...),
+    token_type_hint: str | None = Form(default=None),  # noqa
+    session: AsyncSession = Depends(get_session),
+):
+    # Invalid and expired tokens are answered the same way (RFC 7009 2.2)
+    await AuthService(session=session).revoke(token)
+    return {"message": "Token revoked"}
+
+
+# ------------------------------------------
+# GET /.well-known/jwks.json
+# Public keys to verify the tokens without calling us
+# ------------------------------------------
+_jwks_documents = LRUCache(maxsize=4)
+
+
+@well_known_router.get("/.well-known/jwks.json")
+async def jwks(request: Request):
+    from core.config import get_settings
+
+    max_age = get_settings().JWKS_MAX_AGE
+    _jwt = get_jwt()
+    # Serialized once per max-age, the keys only change with a restart or a window
+    document = _jwks_documents.get(_jwt)
+    if document is None:
+        body = json.dumps(_jwt.jwks(), separators=(",", ":")).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        document = (body, etag)
+        _jwks_documents.set(_jwt, document, expires_at=time.monotonic() + max_age)
+    body, etag = document
+    headers = {"Cache-Control": f"public, max-age={max_age}", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,29 @@
+# apps/auth/models.py
+
+from datetime import datetime
+
+from sqlmodel import Field, DateTime
+
+from core.models import _BaseModel
+from utils.time import current_time
+
+
+class RevokedToken(_BaseModel, table=True):
+    """A token revoked before its expiry (see apps.auth.revocation).
+    Fields:
+        - jti: the id of the token
+        - sub: the user of the token
+        - expires_at: expiry of the token, the row is useless afterwards
+        - revoked_at: datetime when the token was revoked
+    """
+
+    __tablename__ = "revoked_token"
+
+    jti: str = Field(primary_key=True)
+    sub: str
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), index=True)  # type: ignore
+    revoked_at: datetime = Field(
+        default_factory=current_time,
+        sa_type=DateTime(timezone=True),  # type: ignore
+        index=True,
+    )
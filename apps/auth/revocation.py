@@ -0,0 +1,165 @@
+# apps/auth/revocation.py
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from apps.auth.models import RevokedToken
+from core.cache import BloomFilter, LRUCache
+from core.metrics import metrics
+from utils.logging import logger
+from utils.time import current_time
+
+"""
+In-process list of the revoked tokens, so the auth dependencies can reject them
+without a query in the common (not revoked) case.
+- A Bloom filter holds the ids (jti) of all the revoked tokens loaded by the
+  last full load, a miss means "not revoked" without any query.
+- An exact set holds the ids revoked since then, loaded incrementally from the
+  `revoked_token` table every few seconds (and the ones revoked by this worker).
+- A hit in the Bloom filter only is settled by one primary key lookup, the
+  answer is kept (revoked in the set, false positives in a small LRU).
+A token revoked by another worker is rejected here after the next reload.
+"""
+
+# Clock skew between the workers writing `revoked_at`, re-read on each reload
+RELOAD_OVERLAP = timedelta(seconds=30)
+
+
+class RevocationList:
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        recent_limit: int = 10_000,  # full load once the exact set is larger
+        full_load_interval: float = 60 * 60,  # drop the expired tokens hourly
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.recent_limit = recent_limit
+        self.full_load_interval = full_load_interval
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.recent: set[str] = set()
+        # Bloom filter false positives already checked against the table
+        self.cleared = LRUCache(maxsize=4096)
+        self.watermark: datetime | None = None
+        self.loaded_at: float | None = None
+        self.lookups = metrics.counter("revocation.lookups")
+
+    def add(self, jti: str) -> None:
+        """Reject the token in this worker right away, the others reload it."""
+        self.recent.add(jti)
+        self.cleared.pop(jti)
+
+    def might_be_revoked(self, jti: str | None) -> bool:
+        """False when the token is certainly not revoked, no query needed."""
+        if jti is None:
+            return False
+        if jti in self.recent:
+            return True
+        if jti not in self.bloom:
+            return False
+        return jti not in self.cleared
+
+    async def is_revoked(self, jti: str | None, session: AsyncSession) -> bool:
+        if not self.might_be_revoked(jti):
+            return False
+        if jti in self.recent:
+            return True
+        self.lookups.inc()
+        revoked = await session.get(RevokedToken, jti) is not None
+        if revoked:
+            self.recent.add(jti)
+        else:
+            self.cleared.set(jti, True)
+        return revoked
+
+    async def load(self, session_factory: async_sessionmaker) -> None:
+        """Rebuild the Bloom filter from the tokens not expired yet."""
+        start = time.perf_counter()
+        loaded_at = current_time()
+        async with session_factory() as session:
+            jtis = (
+                await session.exec(
+                    select(RevokedToken.jti).where(RevokedToken.expires_at > loaded_at)
+                )
+            ).all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        # Keep the ids revoked while loading, they are not in the new filter
+        self.recent = {jti for jti in self.recent if jti not in bloom}
+        self.bloom = bloom
+        self.cleared.clear()
+        self.watermark = loaded_at
+        self.loaded_at = time.monotonic()
+        logger.info(
+            f"Revocation list loaded, {len(jtis)} tokens in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+    async def reload(self, session_factory: async_sessionmaker) -> None:
+        """Add the tokens revoked since the last load (or reload)."""
+        if (
+            self.watermark is None
+            or len(self.recent) > self.recent_limit
+            or time.monotonic() - self.loaded_at > self.full_load_interval
+        ):
+            return await self.load(session_factory)
+        reloaded_at = current_time()
+        async with session_factory() as session:
+            jtis = await session.exec(
+                select(RevokedToken.jti).where(
+                    RevokedToken.revoked_at > self.watermark - RELOAD_OVERLAP
+                )
+            )
+            for jti in jtis:
+                self.add(jti)
+        self.watermark = reloaded_at
+
+    async def monitor(self, session_factory: async_sessionmaker, interval: float):
+        """Reload periodically, meant to run as a background task."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload(session_factory)
+            except Exception as e:
+                logger.error(f"Revocation list reload failed: {e}")
+
+    def clear(self) -> None:
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.recent.clear()
+        self.cleared.clear()
+        self.watermark = None
+        self.loaded_at = None
+
+    def stats(self) -> dict:
+        return {
+            "bloom": self.bloom.stats(),
+            "recent": len(self.recent),
+            "cleared": len(self.cleared),
+        }
+
+
+@lru_cache()
+def get_revocations() -> RevocationList:
+    from core.config import get_settings
+
+    revocations = RevocationList(capacity=get_settings().REVOCATION_CAPACITY)
+    metrics.gauge("revocation", revocations.stats)
+    return revocations
+
+
+async def purge_expired(engine: AsyncEngine) -> int:
+    """Delete the revocations of the expired tokens, they are rejected anyway."""
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at < current_time())
+        )
+    return result.rowcount
@@ -1,6 +1,9 @@
 # apps/auth/services.py
 
+from datetime import datetime, UTC
+
 from pydantic import EmailStr
+from sqlalchemy import Row
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from apps.auth.exceptions import (
@@ -10,9 +13,16 @@ from apps.auth.exceptions import (
     InvalidCredentialsException,
     InvalidRefreshTokenException,
 )
+from apps.auth.models import RevokedToken
+from apps.auth.revocation import get_revocations
 from apps.users.models import User
 from apps.users.services import UserService
 from core.security import get_jwt, get_pwd_hasher
+from core.security.exceptions import (
+    ExpiredTokenException,
+    InvalidTokenException,
+    InvalidTokenTypeException,
+)
 from core.security.jwt import TokenPair, TokenUser
 
 
@@ -23,18 +33,23 @@ class AuthService:
         self.session = session
         self.user_service = UserService(session=self.session)
 
-    async def authenticate(self, email: EmailStr, password: str) -> User | None:
+    async def authenticate(self, email: EmailStr, password: str) -> User | Row | None:
         """Authenticate user by email and password."""
-        user = await self.user_service.get_user_by_email(email=email)
+        # Read-only, the fast path row is enough to check the credentials.
+        # Deleted users are looked up too, to tell them apart (emails are unique
+        # across the deleted rows as well).
+        user = await self.user_service.including_deleted().get_user_row_by_email(
+            email=email
+        )
         # Check if user exists
         if not user:
             raise UserNotFoundException
+        # Check if user is_deleted, before telling whether the account is active
+        if user.is_deleted:
+            raise UserIsDeletedException
         # Check if user is active
         if not user.is_active:
             raise UserNotActiveException
-        # Check if user is_deleted
-        if user.is_deleted:
-            raise UserIsDeletedException
         if not self.pwd_hasher.verify(password, user.hashed_password):
             raise InvalidCredentialsException
         return user
@@ -55,19 +70,44 @@ class AuthService:
     async def refresh(self, refresh_token: str) -> TokenPair:
         """Refresh access token using refresh token."""
         try:
-            is_valid = self.jwt.verify(token=refresh_token, token_type="refresh")
-            if not is_valid:
-                raise InvalidRefreshTokenException
-            token_data = self.jwt.token_data(token=refresh_token)
-            user = await self.user_service.get_by_id(token_data.id)
-            token_user = TokenUser(
-                id=user.id,
-                email=str(user.email),
-                is_active=user.is_active,
-                is_staff=user.is_staff,
-                is_verified=user.is_verified,
-                is_admin=user.is_admin,
-            )
-            return self.jwt.token_pair(token_user)
-        except ValueError:
+            token_data = self.jwt.decode_typed(refresh_token, "refresh")
+        except (
+            ExpiredTokenException,
+            InvalidTokenException,
+            InvalidTokenTypeException,
+        ):
+            raise InvalidRefreshTokenException
+        if await get_revocations().is_revoked(token_data.jti, self.session):
             raise InvalidRefreshTokenException
+        user = await self.user_service.get_row_by_id(token_data.id)
+        if not user:
+            raise InvalidRefreshTokenException
+        token_user = TokenUser(
+            id=user.id,
+            email=str(user.email),
+            is_active=user.is_active,
+            is_staff=user.is_staff,
+            is_verified=user.is_verified,
+            is_admin=user.is_admin,
+        )
+        return self.jwt.token_pair(token_user)
+
+    async def revoke(self, token: str) -> bool:
+        """Revoke an access or refresh token until it expires, False if there is nothing to revoke."""
+        try:
+            claims = self.jwt.claims(token)
+        except (ExpiredTokenException, InvalidTokenException):
+            return False
+        # Tokens issued before the ids cannot be revoked
+        if claims.jti is None:
+            return False
+        await self.session.merge(
+            RevokedToken(
+                jti=claims.jti,
+                sub=claims.sub,
+                expires_at=datetime.fromtimestamp(claims.exp, UTC),
+            )
+        )
+        await self.session.commit()
+        get_revocations().add(claims.jti)
+        return True
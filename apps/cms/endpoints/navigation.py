@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from apps.cms.services.navigation import NavigationService, NavigationItemService
-from core.database import get_session
+from core.database import SessionRoute, get_session, get_uow_session
 from apps.cms.schemas.navigation import (
     NavigationCreateSchema,
     NavigationUpdateSchema,
@@ -14,7 +14,7 @@ from apps.cms.schemas.navigation import (
 )
 from apps.cms.exceptions import InstanceAlreadyExists
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 # ---------------------------
@@ -24,7 +24,7 @@ router = APIRouter()
     "/", response_model=NavigationResponseSchema, status_code=status.HTTP_201_CREATED
 )
 async def create(
-    data: NavigationCreateSchema, session: AsyncSession = Depends(get_session)
+    data: NavigationCreateSchema, session: AsyncSession = Depends(get_uow_session)
 ):
     service = NavigationService(session)
     try:
@@ -85,7 +85,7 @@ async def delete_navigation(
 async def create_navigation_item(
     navigation_id: str,
     data: NavigationItemCreateSchema,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_uow_session),
 ):
     service = NavigationItemService(session)
     try:
@@ -100,13 +100,13 @@ async def create_navigation_item(
 @router.get("/{navigation_id}/items", response_model=list[NavigationItemResponseSchema])
 async def list_items(navigation_id: str, session: AsyncSession = Depends(get_session)):
     service = NavigationItemService(session)
-    return await service.get_items_by_navigation_id(navigation_id)
+    return await service.list_navigation_items_by_navigation_id(navigation_id)
 
 
 @router.get("/items/{item_id}", response_model=NavigationItemResponseSchema)
 async def get_item(item_id: str, session: AsyncSession = Depends(get_session)):
     service = NavigationItemService(session)
-    item = await service.get_item_by_id(item_id)
+    item = await service.get_navigation_item_by_id(item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Navigation item not found")
     return item
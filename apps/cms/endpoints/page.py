@@ -1,12 +1,18 @@
 # apps/cms/endpoints/page.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from apps.cms.schemas.page import PageCreate, PageUpdate, PageRead
+from apps.cms.schemas.page import (
+    PageCreate,
+    PageUpdate,
+    PageRead,
+    PageSummary,
+)
 from apps.cms.services.page import PageService
-from core.database import get_session
+from core.database import SessionRoute, get_session
+from core.pagination import CursorParams, list_fields, paginate_cursor_or_400
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 def get_page_service(session: AsyncSession = Depends(get_session)) -> PageService:
@@ -21,9 +27,19 @@ async def create_page(
     return await service.create(data)
 
 
-@router.get("/", response_model=list[PageRead])
-async def list_pages(service: PageService = Depends(get_page_service)):
-    return await service.get_all()
+@router.get("/", response_model=list[PageSummary])
+async def list_pages(
+    request: Request,
+    response: Response,
+    pagination: CursorParams = Depends(),
+    fields: list[str] = Depends(list_fields(PageSummary, PageRead)),
+    service: PageService = Depends(get_page_service),
+):
+    if pagination.cursor is not None:
+        return await paginate_cursor_or_400(
+            service, pagination, request, response, fields=fields
+        )
+    return await service.get_all(fields=fields)
 
 
 @router.get("/{page_id}", response_model=PageRead)
@@ -44,12 +60,12 @@ async def get_page_by_slug(
     slug: str,
     service: PageService = Depends(get_page_service),
 ):
-    pages = await service.filter_by(slug=slug)
-    if not pages:
+    page = await service.get_row_by("slug", slug)
+    if not page:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Page not found"
         )
-    return pages[0]
+    return page
 
 
 @router.patch("/{page_id}", response_model=PageRead)
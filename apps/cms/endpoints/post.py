@@ -1,13 +1,19 @@
 # apps/cms/endpoints/post.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from apps.cms.schemas.post import PostCreate, PostUpdate, PostRead
+from apps.cms.schemas.post import (
+    PostCreate,
+    PostUpdate,
+    PostRead,
+    PostSummary,
+)
 from apps.cms.services.post import PostService
-from core.database import get_session
+from core.database import SessionRoute, get_session
+from core.pagination import CursorParams, list_fields, paginate_cursor_or_400
 
-router = APIRouter()
+router = APIRouter(route_class=SessionRoute)
 
 
 def get_post_service(session: AsyncSession = Depends(get_session)) -> PostService:
@@ -27,9 +33,19 @@ async def create_post(
     return await service.create(data)
 
 
-@router.get("/", response_model=list[PostRead], summary="List all Posts")
-async def list_posts(service: PostService = Depends(get_post_service)):
-    return await service.get_all()
+@router.get("/", response_model=list[PostSummary], summary="List all Posts")
+async def list_posts(
+    request: Request,
+    response: Response,
+    pagination: CursorParams = Depends(),
+    fields: list[str] = Depends(list_fields(PostSummary, PostRead)),
+    service: PostService = Depends(get_post_service),
+):
+    if pagination.cursor is not None:
+        return await paginate_cursor_or_400(
+            service, pagination, request, response, fields=fields
+        )
+    return await service.get_all(fields=fields)
 
 
 @router.get("/{post_id}", response_model=PostRead, summary="Get a Post by ID")
@@ -50,12 +66,12 @@ async def get_post_by_slug(
     slug: str,
     service: PostService = Depends(get_post_service),
 ):
-    posts = await service.filter_by(slug=slug)
-    if not posts:
+    post = await service.get_row_by("slug", slug)
+    if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
         )
-    return posts[0]
+    return post
 
 
 @router.patch("/{post_id}", response_model=PostRead, summary="Update a Post")
@@ -3,6 +3,7 @@ from typing import Optional
 
 from sqlmodel import Field, Relationship
 from core.models import BaseTable, SlugMixin
+from apps.cms.models.page import Page
 
 
 class Navigation(BaseTable, SlugMixin, table=True):
@@ -20,6 +21,8 @@ class NavigationItem(BaseTable, SlugMixin, table=True):
 
     # Link targets
     page_id: str | None = Field(default=None, foreign_key="page.id")
+    # Never lazy loaded, resolved in batches by NavigationItemService.resolve_pages
+    page: Optional["Page"] = Relationship(sa_relationship_kwargs={"lazy": "noload"})
     external_url: str | None = None
 
     # Link to Navigation (many-to-one)
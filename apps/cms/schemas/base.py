@@ -14,6 +14,7 @@ from core.schemas import (
     PublishableCreateRequest,
     PublishableUpdateRequest,
     PublishableResponse,
+    ProjectionResponse,
     ResponseSchema,
     TimestampRequest,
 )
@@ -66,6 +67,19 @@ class BaseContentResponseSchema(
     title: str
 
 
+class BaseContentSummarySchema(
+    ULIDPrimaryKeyResponse,
+    SlugResponse,
+    PublishableResponse,
+    TimestampResponse,
+    ProjectionResponse,
+):
+    """Index view of the content, without the bodies and the metadata.
+    The fields asked for with `?fields=` are returned as extra fields."""
+
+    title: str
+
+
 class BaseMetadataOptionals(BaseModel):
     # Create/Update requests
     # SEO fields
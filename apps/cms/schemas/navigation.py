@@ -38,11 +38,18 @@ class NavigationItemUpdateSchema(
     order: int | None = None
 
 
+class NavigationPageSchema(ULIDPrimaryKeyResponse, SlugResponse, ResponseSchema):
+    """The page an item links to, enough to build the link."""
+
+    title: str
+
+
 class NavigationItemResponseSchema(
     NavigationItemOptionals, ULIDPrimaryKeyResponse, SlugResponse, ResponseSchema
 ):
     title: str
     order: int
+    page: NavigationPageSchema | None = None
     children: list["NavigationItemResponseSchema"] = []
 
     @field_serializer("children", when_used="always")
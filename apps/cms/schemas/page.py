@@ -2,6 +2,7 @@
 from ulid import ULID
 from .base import (
     BaseContentSchema,
+    BaseContentSummarySchema,
     BaseContentUpdateSchema,
     BaseMetadataSchema,
     BaseTimestampSchema,
@@ -18,3 +19,7 @@ class PageUpdate(BaseContentUpdateSchema, BaseMetadataSchema, BaseTimestampSchem
 
 class PageRead(PageCreate):
     id: str | ULID | None = None
+
+
+class PageSummary(BaseContentSummarySchema):
+    pass
@@ -2,6 +2,7 @@
 from ulid import ULID
 from .base import (
     BaseContentSchema,
+    BaseContentSummarySchema,
     BaseContentUpdateSchema,
     BaseMetadataSchema,
     BaseTimestampSchema,
@@ -20,3 +21,8 @@ class PostUpdate(BaseContentUpdateSchema, BaseMetadataSchema, BaseTimestampSchem
 
 class PostRead(PostCreate):
     id: str | ULID | None = None
+
+
+class PostSummary(BaseContentSummarySchema):
+    category: str | None = None
+    tags: list[str] | None = None
@@ -1,11 +1,14 @@
 # apps/cms/services/navigation.py
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import cast
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from apps.cms.models.navigation import Navigation, NavigationItem
+from apps.cms.services.page import PageService
 from apps.cms.schemas.navigation import (
     NavigationCreateSchema,
     NavigationItemCreateSchema,
@@ -30,20 +33,14 @@ class NavigationService(BaseService):
         instance = Navigation(**data.model_dump(exclude={"slug"}), slug=slug)
         self.session.add(instance)
         try:
-            await self.session.commit()
-            await self.session.refresh(instance)
+            await self.save(instance)
         except IntegrityError:
             await self.session.rollback()
             raise InstanceAlreadyExists
 
-        # Explicitly load the items after refresh
-        stmt: Select = (
-            select(Navigation)
-            .where(Navigation.id == instance.id)
-            .options(selectinload(cast(InstrumentedAttribute, Navigation.items)))
-        )
-        result = await self.session.exec(stmt)
-        return result.one()
+        # A new navigation has no items, no need to load them from the DB
+        set_committed_value(instance, "items", [])
+        return instance
 
     async def get_navigation_by_id(self, navigation_id: str) -> Navigation | None:
         stmt: Select = (
@@ -52,12 +49,18 @@ class NavigationService(BaseService):
             .options(selectinload(cast(InstrumentedAttribute, Navigation.items)))
         )
         result = await self.session.exec(stmt)
-        return result.one_or_none()
+        instance = result.one_or_none()
+        await self.release()
+        if instance is not None:
+            await NavigationItemService(self.session).resolve_pages(instance.items)
+        return instance
 
     async def get_navigation_by_slug(self, slug: str) -> Navigation | None:
         stmt: Select = select(Navigation).where(Navigation.slug == slug)
         result = await self.session.exec(stmt)
-        return result.one_or_none()
+        instance = result.one_or_none()
+        await self.release()
+        return instance
 
 
 # ---------------------------
@@ -79,20 +82,15 @@ class NavigationItemService(BaseService):
         )
         self.session.add(instance)
         try:
-            await self.session.commit()
-            await self.session.refresh(instance)
+            await self.save(instance)
         except IntegrityError:
             await self.session.rollback()
             raise InstanceAlreadyExists
 
-        # Explicitly load the navigation items after refresh
-        stmt: Select = (
-            select(NavigationItem)
-            .where(NavigationItem.id == instance.id)
-            .options(selectinload(cast(InstrumentedAttribute, NavigationItem.children)))
-        )
-        result = await self.session.exec(stmt)
-        return result.one()
+        # A new navigation item has no children, no need to load them from the DB
+        set_committed_value(instance, "children", [])
+        await self.resolve_pages([instance])
+        return instance
 
     async def get_navigation_item_by_id(
         self, navigation_item_id: str
@@ -103,12 +101,18 @@ class NavigationItemService(BaseService):
             .options(selectinload(cast(InstrumentedAttribute, NavigationItem.children)))
         )
         result = await self.session.exec(stmt)
-        return result.one_or_none()
+        instance = result.one_or_none()
+        await self.release()
+        if instance is not None:
+            await self.resolve_pages([instance])
+        return instance
 
     async def get_navigation_item_by_slug(self, slug: str) -> NavigationItem | None:
         stmt: Select = select(NavigationItem).where(NavigationItem.slug == slug)
         result = await self.session.exec(stmt)
-        return result.one_or_none()
+        instance = result.one_or_none()
+        await self.release()
+        return instance
 
     async def list_navigation_items_by_navigation_id(
         self, navigation_id: str
@@ -121,7 +125,30 @@ class NavigationItemService(BaseService):
             .options(selectinload(cast(InstrumentedAttribute, NavigationItem.children)))
         )
         result = await self.session.exec(stmt)
-        return result.all()
+        items = result.all()
+        await self.release()
+        await self.resolve_pages(items)
+        return items
+
+    async def resolve_pages(
+        self, items: Sequence[NavigationItem]
+    ) -> Sequence[NavigationItem]:
+        """Set the `page` of the items and of their loaded children, one query for
+        all the pages. Soft deleted pages resolve to None."""
+        linked = []
+        pending = list(items)
+        while pending:
+            item = pending.pop()
+            if item.page_id is not None:
+                linked.append(item)
+            if "children" not in inspect(item).unloaded:
+                pending.extend(item.children)
+        pages = await PageService(self.session).load_many(
+            item.page_id for item in linked
+        )
+        for item, page in zip(linked, pages):
+            set_committed_value(item, "page", page)
+        return items
 
     async def update_item(self, item_id: str, data: dict) -> NavigationItem | None:
         """Update a navigation item by ID."""
@@ -7,5 +7,7 @@ from apps.cms.models.page import Page
 
 
 class PageService(BaseService):
+    cache_ttl = 60
+
     def __init__(self, session: AsyncSession):
         super().__init__(model=Page, session=session)
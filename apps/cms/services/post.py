@@ -6,5 +6,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 class PostService(BaseService):
+    cache_ttl = 60
+
     def __init__(self, session: AsyncSession):
         super().__init__(Post, session)
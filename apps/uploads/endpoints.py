@@ -1,14 +1,30 @@
 # apps/uploads/endpoints.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-
-from core.database import get_session
-from core.security.jwt import TokenUser
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    HTTPException,
+    Depends,
+    Request,
+    Response,
+)
+from sqlmodel import select
+
+from core.database import SessionRoute, get_async_sessionmaker, get_session
+from core.pagination import CursorParams, list_fields, paginate_cursor_or_400
+from core.streaming import ndjson_response, wants_ndjson
+from core.security.claims import Claims
 from apps.auth.deps import active_user_token
-from apps.uploads.schemas import UploadRead
+from apps.uploads.schemas import UploadRead, UploadSummary
+from apps.uploads.models import Upload
 from apps.uploads.services import UploadService
 
-router = APIRouter(tags=["uploads"])
+# File transfers to the storage backend take longer than the default deadline,
+# applied to the /uploads paths by the DeadlineMiddleware (see main.py)
+UPLOADS_DEADLINE = 120
+
+router = APIRouter(tags=["uploads"], route_class=SessionRoute)
 
 
 def get_upload_service(session=Depends(get_session)) -> UploadService:
@@ -19,27 +35,47 @@ def get_upload_service(session=Depends(get_session)) -> UploadService:
 async def upload(
     file: UploadFile = File(...),
     public: bool = False,
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
     service: UploadService = Depends(get_upload_service),
 ):
     upload = await service.save_upload_file(file, token_user, public)
     return upload
 
 
-@router.get("/", response_model=list[UploadRead])
+@router.get("/", response_model=list[UploadSummary])
 async def list_all(
-    token_user: TokenUser = Depends(active_user_token),
+    request: Request,
+    response: Response,
+    pagination: CursorParams = Depends(),
+    fields: list[str] = Depends(list_fields(UploadSummary, UploadRead)),
+    token_user: Claims = Depends(active_user_token),
     service: UploadService = Depends(get_upload_service),
+    session_factory=Depends(get_async_sessionmaker),
 ):
+    stmt = None
+    if not token_user.is_staff:
+        stmt = select(Upload).where(Upload.owner_id == token_user.id)
+    # Accept: application/x-ndjson streams all the (visible) uploads
+    if wants_ndjson(request):
+        return ndjson_response(
+            session_factory, UploadService, UploadSummary, stmt=stmt, fields=fields
+        )
+    if pagination.cursor is not None:
+        uploads = await paginate_cursor_or_400(
+            service, pagination, request, response, stmt=stmt, fields=fields
+        )
+    else:
+        uploads = await service.get_all(stmt, fields=fields)
+    # Staff see the uploads of everyone, with their owners
     if token_user.is_staff:
-        return await service.get_all()
-    return await service.get_user_uploads(token_user.id)
+        await service.resolve_owners(uploads)
+    return uploads
 
 
 @router.get("/{upload_id}", response_model=UploadRead)
 async def get_upload(
     upload_id: str,
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
     service: UploadService = Depends(get_upload_service),
 ):
     upload = await service.get_by_id(upload_id)
@@ -56,7 +92,7 @@ async def get_upload(
 @router.delete("/{upload_id}", status_code=204)
 async def delete_upload(
     upload_id: str,
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
     service: UploadService = Depends(get_upload_service),
 ):
     upload = await service.get_by_id(upload_id)
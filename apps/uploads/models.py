@@ -1,7 +1,10 @@
 # apps/uploads/models.py
 
-from sqlmodel import Field
-from core.models import BaseTable
+from typing import Optional
+
+from sqlmodel import Field, Relationship
+from core.models import BaseTable, live_index
+from apps.users.models import User
 
 
 class Upload(BaseTable, table=True):
@@ -20,3 +23,7 @@ class Upload(BaseTable, table=True):
 
     # foreign key to user
     owner_id: str = Field(foreign_key="user.id", index=True)
+    # Never lazy loaded, resolved in batches by UploadService.resolve_owners
+    owner: Optional["User"] = Relationship(sa_relationship_kwargs={"lazy": "noload"})
+
+    __table_args__ = (live_index("upload", "owner_id"),)
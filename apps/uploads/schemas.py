@@ -5,6 +5,8 @@ from sqlmodel import SQLModel
 from pydantic import HttpUrl
 from typing import Optional, Literal
 
+from core.schemas import ProjectionResponse, ResponseSchema
+
 
 class UploadBase(SQLModel):
     file_name: str
@@ -30,6 +32,25 @@ class UploadRead(UploadBase):
     updated_at: datetime
 
 
+class UploadOwner(ResponseSchema):
+    id: str
+    email: str
+
+
+class UploadSummary(ProjectionResponse):
+    """Index view of an upload, `?fields=` adds fields of UploadRead as extras."""
+
+    id: str
+    file_name: str
+    url: HttpUrl | str
+    public: bool = False
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    owner_id: str
+    created_at: datetime
+    owner: UploadOwner | None = None  # resolved for the staff listings
+
+
 class UploadUpdate(UploadBase):
     title: str | None = None
     description: str | None = None
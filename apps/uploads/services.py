@@ -1,25 +1,31 @@
 # apps/uploads/services.py
 
+from collections.abc import Sequence
+
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import UploadFile, HTTPException, status
 
 from apps.uploads.models import Upload
 from apps.uploads.storages import get_storage
+from apps.users.services import UserService
 from sqlmodel import select
 import hashlib
 
-from core.security.jwt import TokenUser
+from core.security.claims import Claims
 from core.services import BaseService
 
 
 class UploadService(BaseService):
+    cache_ttl = 30
+
     def __init__(self, session: AsyncSession):
         super().__init__(model=Upload, session=session)
 
     async def save_upload_file(
         self,
         file: UploadFile,
-        user: TokenUser,
+        user: Claims,
         public: bool = False,
     ) -> Upload:
         storage = get_storage(public=public)
@@ -42,11 +48,7 @@ class UploadService(BaseService):
             storage_backend=storage.name,
             md5=md5_hash,
         )
-
-        self.session.add(upload)
-        await self.session.commit()
-        await self.session.refresh(upload)
-        return upload
+        return await self.create(upload)
 
     async def delete_upload(self, upload: Upload):
         if upload.reference_count > 0:
@@ -57,12 +59,23 @@ class UploadService(BaseService):
         storage = get_storage()
         await storage.delete_file(upload.file_name)
         await self.session.delete(upload)
-        await self.session.commit()
+        await self.save()
+        self.evict(upload)
 
-    async def get_user_uploads(self, user_id: str) -> list[Upload]:
+    async def get_user_uploads(
+        self, user_id: str, fields: list[str] | None = None
+    ) -> list[Upload]:
         stmt = select(self.model).where(self.model.owner_id == user_id)
-        result = await self.session.exec(stmt)
-        return result.all()
+        return await self.get_all(stmt, fields=fields)
+
+    async def resolve_owners(self, uploads: Sequence[Upload]) -> Sequence[Upload]:
+        """Set the `owner` of the uploads, one query for all the owners."""
+        owners = await UserService(self.session).load_many(
+            upload.owner_id for upload in uploads
+        )
+        for upload, owner in zip(uploads, owners):
+            set_committed_value(upload, "owner", owner)
+        return uploads
 
     async def get_upload_with_url(self, upload_id: str) -> Upload:
         upload = await self.get_by_id(upload_id)
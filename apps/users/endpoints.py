@@ -1,7 +1,15 @@
 # apps/users/endpoints.py
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    BackgroundTasks,
+    Request,
+    Response,
+)
 from ulid import ULID
 from sqlmodel.ext.asyncio.session import AsyncSession
 from apps.auth.services import AuthService
@@ -13,14 +21,16 @@ from apps.auth.deps import (
 )
 from apps.users.models import User
 from apps.users.schemas import UserRead, UserCreate, UserUpdate, UserUpdateMe
-from core.database import get_session
+from core.database import SessionRoute, get_async_sessionmaker, get_session
+from core.pagination import CursorParams, paginate_cursor_or_400
+from core.streaming import ndjson_response, wants_ndjson
 from apps.users.services import (
     UserService,
 )
-from core.security.jwt import TokenUser
+from core.security.claims import Claims
 from utils.email import send_verification_email
 
-router = APIRouter(tags=["users"])
+router = APIRouter(tags=["users"], route_class=SessionRoute)
 
 
 # ------------------------------------------
@@ -55,10 +65,19 @@ async def create_new_user(
 # ------------------------------------------
 @router.get("/", response_model=List[UserRead])
 async def read_users(
+    request: Request,
+    response: Response,
+    pagination: CursorParams = Depends(),
     session: AsyncSession = Depends(get_session),
+    session_factory=Depends(get_async_sessionmaker),
     _=Depends(staff_user_token),
 ):
+    # Accept: application/x-ndjson streams the whole table
+    if wants_ndjson(request):
+        return ndjson_response(session_factory, UserService, UserRead)
     user_service = UserService(session=session)
+    if pagination.cursor is not None:
+        return await paginate_cursor_or_400(user_service, pagination, request, response)
     return await user_service.get_all()
 
 
@@ -68,12 +87,13 @@ async def read_users(
 # ------------------------------------------
 @router.get("/me", response_model=UserRead)
 async def read_current_user(
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
     session: AsyncSession = Depends(get_session),
 ):
     user_service = UserService(session=session)
-    user = await user_service.get_by_id(token_user.id)
-    if not user or user.is_deleted:
+    # Soft deleted users are not found
+    user = await user_service.get_row_by_id(token_user.id)
+    if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
@@ -86,7 +106,7 @@ async def read_current_user(
 async def read_user(
     user_id: ULID,
     session: AsyncSession = Depends(get_session),
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
 ):
     user: User = await active_user(session, token_user)
     if not user:
@@ -110,7 +130,7 @@ async def read_user(
 async def update_current_user(
     user_update: UserUpdateMe,
     session: AsyncSession = Depends(get_session),
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
 ):
     user_service = UserService(session=session)
     user = await user_service.update_by_id(
@@ -128,7 +148,7 @@ async def update_existing_user(
     user_id: ULID,
     user_update: UserUpdate,
     session: AsyncSession = Depends(get_session),
-    token_user: TokenUser = Depends(staff_user_token),
+    token_user: Claims = Depends(staff_user_token),
 ):
     if not token_user.is_staff:
         raise HTTPException(
@@ -147,7 +167,7 @@ async def update_existing_user(
 
 @router.delete("/me")
 async def delete_own_account(
-    token_user: TokenUser = Depends(active_user_token),
+    token_user: Claims = Depends(active_user_token),
     session: AsyncSession = Depends(get_session),
 ):
     user_service = UserService(session=session)
@@ -160,9 +180,7 @@ async def delete_own_account(
             detail="Staff accounts cannot be deleted",
         )
     # Soft delete
-    user.is_deleted = True
-    session.add(user)
-    await session.commit()
+    await user_service.delete(user)
     return {"detail": "Account deleted successfully"}
 
 
@@ -174,7 +192,7 @@ async def delete_own_account(
 async def delete_existing_user(
     user_id: ULID,
     session: AsyncSession = Depends(get_session),
-    token_user: TokenUser = Depends(admin_user_token),
+    token_user: Claims = Depends(admin_user_token),
 ):
     # Only Staff or Admin can delete users
     if not token_user.is_admin and user_id != token_user.user_id:
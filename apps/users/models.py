@@ -2,7 +2,7 @@
 
 from sqlmodel import Field
 from pydantic import EmailStr
-from core.models import BaseTable
+from core.models import BaseTable, live_index
 
 
 class User(BaseTable, table=True):
@@ -14,6 +14,8 @@ class User(BaseTable, table=True):
     is_staff: bool = Field(default=False)
     is_admin: bool = Field(default=False)
 
+    __table_args__ = (live_index("user", "email"),)
+
     def __repr__(self):
         return f"<User {self.email}>"
 
@@ -1,5 +1,6 @@
 # apps/users/services.py
 
+from sqlalchemy import Row
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import EmailStr
 from sqlmodel import select
@@ -8,6 +9,7 @@ from apps.users.models import User
 from apps.users.schemas import UserCreate, UserUpdate, UserUpdateMe
 from core.security import get_pwd_hasher
 from core.services import BaseService
+from utils.time import current_time
 
 pwd_hasher = get_pwd_hasher()
 
@@ -75,6 +77,7 @@ async def delete_user(user_id: ULID, session: AsyncSession) -> bool:
     if not user:
         return False
     user.is_deleted = True
+    user.deleted_at = current_time()
     session.add(user)
     await session.commit()
     return True
@@ -99,6 +102,10 @@ async def authenticate_user(
 
 
 class UserService(BaseService):
+    # Every authenticated request loads its user, a short TTL bounds how long
+    # other workers may see a deactivated user as active
+    cache_ttl = 10
+
     def __init__(self, session: AsyncSession):
         super().__init__(model=User, session=session)
 
@@ -107,7 +114,13 @@ class UserService(BaseService):
         email_in_db = str(email)
         stmt = select(User).where(User.email == email_in_db)
         result = await self.session.exec(stmt)
-        return result.one_or_none()
+        user = result.one_or_none()
+        await self.release()
+        return user
+
+    async def get_user_row_by_email(self, email: EmailStr) -> Row | None:
+        """Read-only fast path of `get_user_by_email`, returns a Row."""
+        return await self.get_row_by("email", str(email))
 
     async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user.
@@ -127,7 +140,4 @@ class UserService(BaseService):
             is_staff=False,
             is_superuser=False,
         )
-        self.session.add(new_user)
-        await self.session.commit()
-        await self.session.refresh(new_user)
-        return new_user
+        return await self.create(new_user)
@@ -3,7 +3,7 @@ from email.utils import parseaddr
 
 from functools import lru_cache
 from typing import Literal
-from pydantic import EmailStr
+from pydantic import AwareDatetime, BaseModel, EmailStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Annotated
 from pydantic import BeforeValidator
@@ -26,6 +26,18 @@ def validate_smtp_from(value: str) -> str:
 # ------------------------------------------
 
 
+class JWTKeySettings(BaseModel):
+    """An asymmetric signing key, see core/security/keys.py for the rotation."""
+
+    kid: str
+    algorithm: Literal["ES256", "EdDSA"] = "EdDSA"
+    private_key_file: str | None = None  # PEM, None for a key only used to verify
+    public_key_file: str | None = None  # PEM, derived from the private key if None
+    # Compared with the current UTC time, a timezone is required
+    not_before: AwareDatetime | None = None  # start signing with the key
+    not_after: AwareDatetime | None = None  # stop trusting the key
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", env_ignore_empty=True, extra="ignore"
@@ -35,6 +47,29 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # "pgbouncer": PgBouncer in transaction pooling mode sits in front of Postgres
+    DATABASE_POOL_MODE: Literal["direct", "pgbouncer"] = "direct"
+    # Connection pool (one pool per worker process)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 60 * 30  # recycle connections after 30 minutes
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_WARMUP_CONNECTIONS: int = 5  # connections opened at startup
+    # Read replicas, e.g. DATABASE_REPLICA_URLS='["postgresql+asyncpg://..."]'
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_MAX_LAG: float = 5  # seconds behind the primary before fallback
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 10  # seconds between health checks
+    # Per-request statement budget and N+1 detection (see QueryBudgetMiddleware)
+    DB_QUERY_BUDGET: int | None = 50
+    DB_N_PLUS_ONE_THRESHOLD: int | None = 10  # same statement repeated N times
+    DB_QUERY_BUDGET_MODE: Literal["log", "raise"] = "log"
+    # Default request deadline in seconds, also used as the DB statement_timeout
+    REQUEST_DEADLINE: float | None = 30
+    # Deadline of the NDJSON streams (core/streaming.py), None for no deadline
+    STREAM_DEADLINE: float | None = None
+    # Soft deleted rows older than this are archived or deleted (scripts/purge.py)
+    SOFT_DELETE_RETENTION_DAYS: int = 30
 
     # Storage
     STORAGE_BACKEND: Literal["local", "s3"] = "local"
@@ -54,6 +89,18 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     VERIFICATION_TOKEN_EXPIRE_MINUTES: int = 5  # 5 minutes
+    JWT_CACHE_SIZE: int | None = 4096  # verified tokens kept in memory, None disables
+    # Asymmetric keys, e.g. JWT_KEYS='[{"kid": "2026-06", "private_key_file": "..."}]'
+    # the tokens are signed with them instead of SECRET_KEY when set
+    JWT_KEYS: list[JWTKeySettings] = []
+    # With JWT_KEYS, the tokens signed with SECRET_KEY (no kid) are accepted until
+    # then, set it past the expiry of the last of them when switching to the keys
+    JWT_LEGACY_HS_UNTIL: AwareDatetime | None = None
+    JWKS_MAX_AGE: int = 60 * 5  # Cache-Control max-age of /.well-known/jwks.json
+    # Revoked tokens (apps/auth/revocation.py), a token revoked on an other worker
+    # is rejected after at most REVOCATION_RELOAD_INTERVAL seconds
+    REVOCATION_RELOAD_INTERVAL: float = 5
+    REVOCATION_CAPACITY: int = 100_000  # Bloom filter size before it grows
 
     # Admin
     ADMIN_EMAIL: EmailStr
@@ -1,8 +1,35 @@
 # core/database.py
 
+import asyncio
+import functools
+import inspect
+import itertools
+import math
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi import Depends
+from fastapi.routing import APIRoute
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from typing import AsyncGenerator
+from sqlmodel.orm.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.sql import Select
+from typing import AsyncGenerator, Callable, Iterator
+
+from core.exceptions import BaseAppException
+from core.metrics import metrics, ROW_BUCKETS
+from utils.logging import logger
 
 
 # ------------------------------------------
@@ -10,6 +37,7 @@ from typing import AsyncGenerator
 # Import all models !BEFORE! importing SQLModel to ensure that they are registered
 # ------------------------------------------
 from apps.users import models as users  # noqa: F401
+from apps.auth import models as auth  # noqa: F401
 from apps.cms.models import page  # noqa: F401
 from apps.cms.models import post  # noqa: F401
 from apps.cms.models import navigation  # noqa: F401
@@ -19,30 +47,618 @@ from apps.uploads import models as uploads  # noqa: F401
 from sqlmodel import SQLModel  # noqa: F401
 
 
-# Lazy async_engine builder
-def get_async_engine():
-    from core.config import get_settings
-
-    settings = get_settings()
-    return create_async_engine(
-        settings.DATABASE_URL,
-        echo=settings.DEBUG,
-        future=True,
+# ------------------------------------------
+# Instrumentation
+# Pool checkout wait, pool usage, statement latency and rows returned,
+# aggregated in core.metrics and exposed on /health/details.
+# ------------------------------------------
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.histogram("db.pool.checkout_wait_seconds").observe(
+                time.perf_counter() - start
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    metrics.counter("db.statements").inc()
+    metrics.histogram("db.statement.duration_seconds").observe(elapsed)
+    # DML reports its rowcount, the async adapters buffer SELECT rows in `_rows`
+    rows = cursor.rowcount
+    if rows < 0:
+        rows = len(getattr(cursor, "_rows", None) or ())
+    metrics.histogram("db.statement.rows", ROW_BUCKETS).observe(rows)
+
+
+def _handle_error(context) -> None:
+    metrics.counter("db.statement.errors").inc()
+    if context.connection is not None:
+        # The matching after_cursor_execute will never run
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def _on_checkout(*_args) -> None:
+    metrics.counter("db.pool.checkouts").inc()
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """Attach the metrics event hooks to an engine and its pool."""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    event.listen(sync_engine, "checkout", _on_checkout)
+    return engine
+
+
+def _pool_stat(name: str):
+    """Gauge reader for the primary pool, None when the pool does not track it."""
+
+    def read():
+        if _engine is None:
+            return None
+        stat = getattr(_engine.pool, name, None)
+        return stat() if callable(stat) else None
+
+    return read
+
+
+metrics.gauge("db.pool.size", _pool_stat("size"))
+metrics.gauge("db.pool.checked_out", _pool_stat("checkedout"))
+metrics.gauge("db.pool.overflow", _pool_stat("overflow"))
+
+
+# ------------------------------------------
+# Per-request Query Tracking
+# Statements executed while a QueryStats is active (see QueryBudgetMiddleware)
+# are counted per request and grouped by shape (the SQL without the bound
+# values) to spot N+1 patterns. The hooks are registered on the Engine class,
+# so they see every engine, including the replicas.
+# ------------------------------------------
+
+
+class QueryBudgetExceededException(BaseAppException):
+    """Raised when a request goes over its statement budget (raise mode)."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+@dataclass
+class QueryStats:
+    budget: int | None = None
+    n_plus_one_threshold: int | None = None
+    raise_on_violation: bool = False
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `n_plus_one_threshold` times."""
+        if not self.n_plus_one_threshold:
+            return []
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        self.shapes[statement] += 1
+        if not self.raise_on_violation:
+            return
+        if self.over_budget():
+            raise QueryBudgetExceededException(
+                f"Query budget exceeded: {self.count} > {self.budget} statements"
+            )
+        if self.n_plus_one_threshold and (
+            self.shapes[statement] == self.n_plus_one_threshold
+        ):
+            raise QueryBudgetExceededException(
+                f"N+1 query detected, executed {self.shapes[statement]} times: "
+                f"{statement}"
+            )
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(stats: QueryStats) -> Iterator[QueryStats]:
+    """Count the statements executed in the current context."""
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _track_before_execute(conn, cursor, statement, parameters, context, many):
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement)
+        conn.info.setdefault("track_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _track_after_execute(conn, cursor, statement, parameters, context, many):
+    stats = _query_stats.get()
+    starts = conn.info.get("track_start")
+    if stats is not None and starts:
+        stats.duration += time.perf_counter() - starts.pop()
+
+
+@event.listens_for(Engine, "handle_error")
+def _track_error(context) -> None:
+    # The matching after_cursor_execute will never run
+    if context.connection is not None:
+        starts = context.connection.info.get("track_start")
+        if starts:
+            starts.pop()
+
+
+# ------------------------------------------
+# Request Deadlines
+# The deadline of the current request (see DeadlineMiddleware) is applied to
+# every transaction it opens with SET LOCAL statement_timeout, so a slow query
+# is stopped by Postgres instead of pinning its connection. SET LOCAL only lasts
+# for the transaction, which keeps it safe with transaction pooling.
+# ------------------------------------------
+
+
+@dataclass
+class Deadline:
+    expires_at: float  # time.monotonic() based
+    timeout: asyncio.Timeout | None = None
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def reschedule(self, seconds: float | None) -> None:
+        """Move the deadline to `seconds` from now, None lifts it."""
+        if seconds is None:
+            self.expires_at = math.inf
+            if self.timeout is not None:
+                self.timeout.reschedule(None)
+            return
+        self.expires_at = time.monotonic() + seconds
+        if self.timeout is not None:
+            self.timeout.reschedule(asyncio.get_running_loop().time() + seconds)
+
+
+_deadline: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def get_deadline() -> Deadline | None:
+    return _deadline.get()
+
+
+@contextmanager
+def with_deadline(deadline: Deadline) -> Iterator[Deadline]:
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    deadline = _deadline.get()
+    if (
+        deadline is None
+        or deadline.expires_at == math.inf
+        or connection.dialect.name != "postgresql"
+    ):
+        return
+    timeout_ms = max(int(deadline.remaining() * 1000), 1)
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+# ------------------------------------------
+# Read Replicas
+# Reads (SELECT) are routed to a healthy replica, writes and everything after
+# the first flush of a session go to the primary (read-your-writes).
+# ------------------------------------------
+
+# Session.info key that pins a session to the primary
+USE_PRIMARY = "use_primary"
+
+# Session.info key of the replica picked by the current transaction
+REPLICA = "replica"
+
+# Replication lag query, a replica that has replayed everything it received is
+# not lagging even if the primary has been idle for a while.
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaSet:
+    """A round-robin set of read replica engines with health tracking."""
+
+    def __init__(self, engines: list[AsyncEngine], max_lag: float):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.healthy: dict[AsyncEngine, bool] = {e: True for e in engines}
+        self._cycle = itertools.cycle(engines)
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def pick(self) -> AsyncEngine | None:
+        """Return the next healthy replica, or None to fall back to the primary."""
+        for _ in range(len(self.engines)):
+            engine = next(self._cycle)
+            if self.healthy[engine]:
+                return engine
+        return None
+
+    def mark(self, engine: AsyncEngine, healthy: bool) -> None:
+        if self.healthy.get(engine) != healthy:
+            logger.warning(
+                f"Replica {engine.url.render_as_string()} marked "
+                f"{'healthy' if healthy else 'unhealthy'}"
+            )
+        self.healthy[engine] = healthy
+
+    def _on_error(self, context) -> None:
+        # Stop routing to a replica as soon as its connections start failing
+        if context.is_disconnect:
+            for engine in self.engines:
+                if engine.sync_engine is context.engine:
+                    self.mark(engine, False)
+
+    async def lag(self, engine: AsyncEngine) -> float:
+        """Replication lag of a replica in seconds."""
+        async with engine.connect() as conn:
+            if engine.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            return float((await conn.execute(_REPLICA_LAG_SQL)).scalar() or 0.0)
+
+    async def check(self) -> None:
+        """Update the health of every replica (reachable and not lagging)."""
+        for engine in self.engines:
+            try:
+                self.mark(engine, await self.lag(engine) <= self.max_lag)
+            except Exception as e:
+                logger.error(f"Replica health check failed: {e}")
+                self.mark(engine, False)
+
+    async def monitor(self, interval: float) -> None:
+        """Check the replicas periodically, meant to run as a background task."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.check()
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class RoutingSession(Session):
+    """Session that sends plain reads to a replica and everything else to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            _replicas is not None
+            and not self._flushing
+            and not self.info.get(USE_PRIMARY)
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            # One replica per transaction, its reads see a single snapshot
+            replica = self.info.get(REPLICA) or _replicas.pick()
+            if replica is not None:
+                self.info[REPLICA] = replica
+                return replica.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _unpin_replica(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(REPLICA, None)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stick_to_primary(session, _flush_context) -> None:
+    # Read-your-writes: once a session wrote something, it reads from the primary
+    session.info[USE_PRIMARY] = True
+
+
+@contextmanager
+def use_primary(session: AsyncSession) -> Iterator[AsyncSession]:
+    """Force the reads of a session to the primary within the block."""
+    previous = session.info.get(USE_PRIMARY, False)
+    session.info[USE_PRIMARY] = True
+    try:
+        yield session
+    finally:
+        session.info[USE_PRIMARY] = previous
+
+
+# ------------------------------------------
+# Connection Release
+# A session checks a connection out of the pool on its first statement and
+# gives it back when its transaction ends. Read-only transactions are ended
+# right after their results are loaded, so the connection is not held while
+# the response is serialized and sent.
+# Request sessions (get_session) defer this to the end of the endpoint: their
+# reads share one transaction (one checkout, one snapshot) and SessionRoute
+# gives the connection back when the endpoint returns, before the response is
+# serialized and whatever the FastAPI version runs the dependency teardown.
+# ------------------------------------------
+
+# Session.info key set while the current transaction holds flushed writes
+PENDING_WRITES = "pending_writes"
+
+# Session.info key of sessions in unit of work mode, services only flush and the
+# owner of the session commits once (see get_uow_session)
+UNIT_OF_WORK = "unit_of_work"
+
+# Session.info key of request sessions, their reads are released all at once by
+# the owner of the session instead of one by one (see get_session)
+DEFER_RELEASE = "defer_release"
+
+# The sessions deferring their release in the current request
+_request_sessions: ContextVar[list[AsyncSession] | None] = ContextVar(
+    "request_sessions", default=None
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_pending_writes(session, _flush_context) -> None:
+    session.info[PENDING_WRITES] = True
+
+
+def mark_pending_writes(session: Session | AsyncSession) -> None:
+    """Flag writes that did not go through a flush (bulk statements, COPY)."""
+    session.info[PENDING_WRITES] = True
+    session.info[USE_PRIMARY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mark_pending_writes(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_pending_writes(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(PENDING_WRITES, None)
+
+
+async def release_connection(session: AsyncSession, final: bool = False) -> None:
+    """End the transaction of a session that only read, returning its connection.
+
+    Sessions with flushed or pending changes are left alone, their transaction is
+    committed (or rolled back) by whoever owns it. The request sessions deferring
+    their release are only released by their owner (`final=True`).
+    """
+    if (
+        session.in_transaction()
+        and (final or not session.info.get(DEFER_RELEASE))
+        and not session.info.get(PENDING_WRITES)
+        and not (session.new or session.dirty or session.deleted)
+    ):
+        # expire_on_commit=False keeps the loaded instances usable
+        await session.commit()
+
+
+# ------------------------------------------
+# Engine & Session Factory
+# One engine (and therefore one connection pool) per worker process.
+# It is created by the app lifespan (see main.py) and disposed on shutdown,
+# but it is also built lazily on first use, so scripts and tests keep working.
+# ------------------------------------------
+_engine: AsyncEngine | None = None
+_replicas: ReplicaSet | None = None
+_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def _prepared_statement_name() -> str:
+    # PgBouncer may hand the next transaction to another server connection,
+    # unique names never collide with a statement prepared by another client.
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
+def engine_kwargs(settings, url: str) -> dict:
+    """Build the create_async_engine keyword arguments from the settings."""
+    backend = make_url(url).get_backend_name()
+    kwargs = {
+        "echo": settings.DEBUG,
+        "future": True,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+    # SQLite (tests, local dev) uses a single-connection pool that does not
+    # accept the queue pool sizing arguments.
+    if backend == "sqlite":
+        return kwargs
+
+    if settings.DATABASE_POOL_MODE == "pgbouncer":
+        # PgBouncer (transaction pooling) owns the server connections: no pool
+        # of our own, and no prepared statement outliving its transaction.
+        # Session state is never relied on (statement_timeout uses SET LOCAL).
+        kwargs.update(poolclass=NullPool, pool_pre_ping=False)
+        if make_url(url).get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _prepared_statement_name,
+            }
+        return kwargs
+
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
     )
+    return kwargs
+
+
+def init_engine() -> AsyncEngine:
+    """Create the process-wide engine and session factory (idempotent)."""
+    global _engine, _replicas, _sessionmaker
+    if _engine is None:
+        from core.config import get_settings
+
+        settings = get_settings()
+        _engine = instrument_engine(
+            create_async_engine(
+                settings.DATABASE_URL,
+                **engine_kwargs(settings, settings.DATABASE_URL),
+            )
+        )
+        if settings.DATABASE_REPLICA_URLS:
+            _replicas = ReplicaSet(
+                [
+                    instrument_engine(
+                        create_async_engine(url, **engine_kwargs(settings, url))
+                    )
+                    for url in settings.DATABASE_REPLICA_URLS
+                ],
+                max_lag=settings.DATABASE_REPLICA_MAX_LAG,
+            )
+        _sessionmaker = async_sessionmaker(
+            bind=_engine,
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+        )
+    return _engine
+
+
+def get_replicas() -> ReplicaSet | None:
+    """The read replicas of the process, None when no replica is configured."""
+    init_engine()
+    return _replicas
+
+
+async def dispose_engine() -> None:
+    """Close all pooled connections and forget the engine."""
+    global _engine, _replicas, _sessionmaker
+    if _replicas is not None:
+        await _replicas.dispose()
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _replicas = None
+    _sessionmaker = None
+
+
+# Lazy async_engine builder
+def get_async_engine() -> AsyncEngine:
+    return init_engine()
 
 
 # Lazy async_sessionmaker
-def get_async_sessionmaker():
-    engine = get_async_engine()
-    return async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    init_engine()
+    return _sessionmaker
+
+
+def defer_release(session: AsyncSession) -> AsyncSession:
+    """Make the reads of a request session share one transaction, released once
+    the endpoint returns (see SessionRoute)."""
+    session.info[DEFER_RELEASE] = True
+    sessions = _request_sessions.get()
+    if sessions is not None:
+        sessions.append(session)
+    return session
+
+
+async def release_request_sessions() -> None:
+    """Give back the connections of the request sessions that only read."""
+    for session in _request_sessions.get() or ():
+        await release_connection(session, final=True)
+
+
+class SessionRoute(APIRoute):
+    """Route releasing the request sessions as soon as the endpoint returns,
+    so their connections are not held while the response is serialized."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _releasing(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request):
+            # The dependencies and the endpoint run in this context
+            token = _request_sessions.set([])
+            try:
+                return await handler(request)
+            finally:
+                _request_sessions.reset(token)
+
+        return route_handler
+
+
+def _releasing(endpoint: Callable) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        await release_request_sessions()
+        return result
+
+    return wrapper
 
 
 # Dependency for FastAPI
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Request scoped session, no connection is taken until the first statement.
+
+    The reads of the request share one transaction, ended when the endpoint
+    returns (SessionRoute) or else when the session closes.
+    """
     async_session = get_async_sessionmaker()
     async with async_session() as session:
+        yield defer_release(session)
+
+
+# Dependency for FastAPI, unit of work mode
+async def get_uow_session(
+    session: AsyncSession = Depends(get_session),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Request scoped unit of work.
+
+    Service writes are only flushed, the whole request is committed once when the
+    endpoint returns and rolled back if it raises.
+    """
+    session.info[UNIT_OF_WORK] = True
+    try:
         yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
@@ -0,0 +1,112 @@
+# core/metrics.py
+
+from bisect import bisect_left
+from typing import Callable
+
+"""
+In-process metrics: counters, histograms and gauges aggregated per worker.
+They are cheap enough to be updated on every statement and are exposed as a
+JSON snapshot (see /health/details in main.py).
+"""
+
+# Default latency buckets in seconds (upper bounds, the last bucket is +Inf)
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Default buckets for row counts
+ROW_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000)
+
+
+class Counter:
+    """A monotonically increasing counter."""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Histogram:
+    """A fixed bucket histogram, keeps the count, sum and max of the observations."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> dict:
+        # Cumulative bucket counts, same semantics as Prometheus `le` buckets
+        buckets, total = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            buckets[str(bound)] = total
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._counters: dict[str, Counter] = {}
+        self._histograms: dict[str, Histogram] = {}
+        self._gauges: dict[str, Callable[[], float | int | None]] = {}
+
+    def counter(self, name: str) -> Counter:
+        if name not in self._counters:
+            self._counters[name] = Counter()
+        return self._counters[name]
+
+    def histogram(self, name: str, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        if name not in self._histograms:
+            self._histograms[name] = Histogram(buckets)
+        return self._histograms[name]
+
+    def gauge(self, name: str, fn: Callable[[], float | int | None]) -> None:
+        """Register a gauge, its value is read from `fn` when a snapshot is taken."""
+        self._gauges[name] = fn
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": {k: v.snapshot() for k, v in self._counters.items()},
+            "gauges": {k: fn() for k, fn in self._gauges.items()},
+            "histograms": {k: v.snapshot() for k, v in self._histograms.items()},
+        }
+
+    def reset(self) -> None:
+        """Drop all counters and histograms (gauges are kept)."""
+        self._counters.clear()
+        self._histograms.clear()
+
+
+metrics = MetricsRegistry()
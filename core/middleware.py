@@ -0,0 +1,162 @@
+# core/middleware.py
+
+import asyncio
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.database import (
+    Deadline,
+    QueryStats,
+    get_deadline,
+    track_queries,
+    with_deadline,
+)
+from utils.logging import logger
+
+
+class QueryBudgetMiddleware:
+    """Count the DB statements of every request and flag N+1 patterns.
+
+    Requests over DB_QUERY_BUDGET statements, or repeating one statement shape
+    DB_N_PLUS_ONE_THRESHOLD times or more, are logged (or rejected with
+    DB_QUERY_BUDGET_MODE="raise"). In DEBUG mode the responses carry the
+    statement count and time in `X-DB-Queries` and `Server-Timing` headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        from core.config import get_settings
+
+        settings = get_settings()
+        stats = QueryStats(
+            budget=settings.DB_QUERY_BUDGET,
+            n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
+            raise_on_violation=settings.DB_QUERY_BUDGET_MODE == "raise",
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        with track_queries(stats):
+            await self.app(scope, receive, send_wrapper)
+
+        path = f"{scope['method']} {scope['path']}"
+        if stats.over_budget():
+            logger.warning(
+                f"{path} executed {stats.count} statements (budget {stats.budget})"
+            )
+        for shape, count in stats.repeated():
+            logger.warning(f"{path} possible N+1, executed {count} times: {shape}")
+
+
+class DeadlineMiddleware:
+    """Give every request a deadline (REQUEST_DEADLINE, overridable by path prefix).
+
+    The request is cancelled, including its in-flight DB statements, when the
+    deadline passes (answered with 504) or when the client disconnects. The
+    remaining time also becomes the statement_timeout of its DB transactions.
+    The overrides apply from the first byte of the request body, use them for
+    the routes receiving large bodies (request_deadline only starts once the
+    body has been read).
+    """
+
+    def __init__(self, app: ASGIApp, overrides: dict[str, float | None] | None = None):
+        self.app = app
+        # Longest prefix first
+        self.overrides = sorted((overrides or {}).items(), key=lambda o: -len(o[0]))
+
+    def deadline(self, path: str) -> float | None:
+        from core.config import get_settings
+
+        for prefix, seconds in self.overrides:
+            if path.startswith(prefix):
+                return seconds
+        return get_settings().REQUEST_DEADLINE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        seconds = self.deadline(scope["path"])
+        if not seconds:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(expires_at=time.monotonic() + seconds)
+        response_started = False
+        # The watcher owns `receive`, it forwards the messages to the app and
+        # notices the client disconnecting while the request is being processed.
+        # One message at a time, the body is read as fast as the app reads it.
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        async def run_app() -> None:
+            async with asyncio.timeout(seconds) as timeout:
+                deadline.timeout = timeout
+                await self.app(scope, messages.get, send_wrapper)
+
+        with with_deadline(deadline):
+            app_task = asyncio.create_task(run_app())
+
+        async def watch_disconnect() -> None:
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    app_task.cancel()
+                    return
+                await messages.put(message)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await app_task
+        except TimeoutError:
+            logger.warning(f"{scope['method']} {scope['path']} deadline exceeded")
+            if not response_started:
+                response = JSONResponse(
+                    status_code=504, content={"detail": "Request deadline exceeded"}
+                )
+                await response(scope, receive, send)
+        except asyncio.CancelledError:
+            if not app_task.cancelled() or asyncio.current_task().cancelling():
+                raise
+            # The client went away, there is nobody to answer
+            logger.info(f"{scope['method']} {scope['path']} client disconnected")
+        finally:
+            watcher.cancel()
+
+
+def request_deadline(seconds: float):
+    """Router/route dependency overriding the default request deadline.
+
+    Usage: APIRouter(dependencies=[Depends(request_deadline(120))])
+    It runs once the request body has been read, the routes receiving large
+    bodies are given their deadline by the DeadlineMiddleware overrides.
+    """
+
+    async def _deadline() -> None:
+        deadline = get_deadline()
+        if deadline is not None:
+            deadline.reschedule(seconds)
+
+    return _deadline
@@ -1,4 +1,6 @@
 # core/models.py
+from sqlalchemy import JSON, Index, text
+from sqlalchemy.orm import declared_attr
 from sqlmodel import Field, SQLModel, DateTime
 from datetime import datetime
 from ulid import ULID
@@ -66,6 +68,19 @@ class PublishableMixin:
     )
 
 
+def live_index(table: str, *columns: str) -> Index:
+    """Partial index of the rows that are not soft deleted.
+    BaseService leaves the deleted rows out of its queries, so the lookups of the
+    live rows use this smaller index."""
+    where = text("is_deleted = false")
+    return Index(
+        f"ix_{table}_{'_'.join(columns)}_live",
+        *columns,
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
 class SlugMixin:
     """Mixin for models with slug fields.
     Fields:
@@ -74,6 +89,11 @@ class SlugMixin:
 
     slug: str = Field(index=True, unique=True)  # Unique slug for the model
 
+    # noinspection PyMethodParameters
+    @declared_attr
+    def __table_args__(cls):
+        return (live_index(cls.__tablename__, "slug"),)
+
 
 class SoftDeleteMixin:
     """Mixin for models with soft delete fields.
@@ -102,4 +122,28 @@ class BaseTable(
 
     # This class is not a table itself, but can be used as a base for other models
     # that need to inherit from it.
-    pass
+
+    # Fetch server generated values with RETURNING during the flush instead of a
+    # separate SELECT (refresh) after it.
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class ArchivedRow(_BaseModel, table=True):
+    """A soft deleted row moved out of its table by the purge job (core.purge).
+    Fields:
+        - table_name, id: the table and the id the row had
+        - data: the column values of the row
+        - deleted_at: datetime when the row was softly deleted
+        - archived_at: datetime when the row was archived
+    """
+
+    __tablename__ = "archive"
+
+    table_name: str = Field(primary_key=True)
+    id: str = Field(primary_key=True)
+    data: dict = Field(sa_type=JSON)
+    deleted_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))  # type: ignore
+    archived_at: datetime = Field(
+        default_factory=current_time,
+        sa_type=DateTime(timezone=True),  # type: ignore
+    )
@@ -0,0 +1,136 @@
+# core/pagination.py
+"""
+Keyset (cursor) pagination on the ULID primary keys.
+ULIDs are time ordered, so seeking on `id` pages through the rows in creation
+order without the linear cost of OFFSET on deep pages. Cursors are opaque to
+the clients: the direction and the id of the boundary row, base64 encoded.
+"""
+
+import base64
+import binascii
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Literal, TypeVar
+
+from fastapi import HTTPException, Query, Request, Response, status
+from pydantic import BaseModel
+
+from core.exceptions import BaseServiceException
+
+T = TypeVar("T")
+
+
+class InvalidCursorException(BaseServiceException):
+    """Exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor: str):
+        super().__init__(f"Invalid cursor '{cursor}'.")
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def encode_cursor(id_: str, direction: str = "next") -> str:
+    raw = f"{'n' if direction == 'next' else 'p'}:{id_}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Return (direction, id) of a cursor, direction is 'next' or 'prev'."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, id_ = base64.urlsafe_b64decode(padded).decode().split(":", 1)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorException(cursor)
+    if direction not in ("n", "p") or not id_:
+        raise InvalidCursorException(cursor)
+    return ("next" if direction == "n" else "prev"), id_
+
+
+# ------------------------------------------
+# Endpoint helpers
+# ------------------------------------------
+
+
+@dataclass
+class CursorParams:
+    """Query parameters of cursor paginated list endpoints.
+
+    `?cursor=` (empty) asks for the first page, the next/prev pages are linked
+    from the `Link` response header. Without `cursor` the endpoints keep
+    returning the whole list. `?total=` adds the `X-Total-Count` header,
+    counted exactly, estimated from the planner statistics or cached.
+    """
+
+    cursor: str | None = Query(
+        default=None, description="Pagination cursor, empty for the first page"
+    )
+    limit: int = Query(default=20, ge=1, le=100)
+    total: Literal["exact", "estimated", "cached"] | None = Query(
+        default=None, description="Add the X-Total-Count header"
+    )
+
+
+def list_fields(summary: type[BaseModel], full: type[BaseModel]) -> Callable:
+    """Dependency of the `?fields=` query parameter of list endpoints.
+
+    Lists load the fields of the `summary` schema, `?fields=a,b` adds fields of
+    the `full` schema and `?fields=*` loads them all. Returns the projection to
+    pass to the service query methods.
+    """
+
+    def dependency(
+        fields: str | None = Query(
+            default=None,
+            description="Comma separated fields to add to the summary, * for all",
+        ),
+    ) -> list[str]:
+        if fields == "*":
+            requested = list(full.model_fields)
+        else:
+            requested = [f.strip() for f in (fields or "").split(",") if f.strip()]
+        unknown = set(requested) - set(full.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        return list(dict.fromkeys([*summary.model_fields, *requested]))
+
+    return dependency
+
+
+def set_link_header(request: Request, response: Response, page: CursorPage) -> None:
+    """Add RFC 8288 `Link` headers pointing to the next and previous pages."""
+    links = []
+    for rel, cursor in (("next", page.next_cursor), ("prev", page.prev_cursor)):
+        if cursor:
+            url = request.url.include_query_params(cursor=cursor)
+            links.append(f'<{url}>; rel="{rel}"')
+    if links:
+        response.headers["Link"] = ", ".join(links)
+
+
+async def paginate_cursor_or_400(
+    service,
+    params: CursorParams,
+    request: Request,
+    response: Response,
+    **kwargs,
+) -> list:
+    """Run `service.paginate_cursor` for an endpoint and set its headers."""
+    try:
+        page = await service.paginate_cursor(
+            cursor=params.cursor, limit=params.limit, **kwargs
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    set_link_header(request, response, page)
+    if params.total is not None:
+        total = await service.count_total(kwargs.get("stmt"), params.total)
+        response.headers["X-Total-Count"] = str(total.value)
+        response.headers["X-Total-Count-Mode"] = total.mode
+    return page.items
@@ -0,0 +1,134 @@
+# core/purge.py
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import StrEnum
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Table, delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+
+from core.models import ArchivedRow
+from utils.time import current_time
+
+"""
+Purge of the soft deleted rows.
+Rows deleted for longer than the retention period are moved to the `archive`
+table (or deleted) in small transactions, so the hot tables and their indexes
+only hold live rows without long locks on them.
+Children tables are purged before their parents, and rows still referenced by
+a foreign key are kept until their referrers are gone.
+"""
+
+
+class PurgeMode(StrEnum):
+    ARCHIVE = "archive"  # copy to the archive table, then delete
+    DELETE = "delete"
+
+
+@dataclass
+class PurgeStats:
+    table: str
+    rows: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def purgeable_tables() -> list[Table]:
+    """Soft delete tables, children first."""
+    return [
+        table
+        for table in reversed(SQLModel.metadata.sorted_tables)
+        if "is_deleted" in table.c and "deleted_at" in table.c
+    ]
+
+
+def _referrers(table: Table):
+    """Foreign keys (of all the tables) pointing to `table`."""
+    for other in SQLModel.metadata.tables.values():
+        for fk in other.foreign_keys:
+            if fk.column.table is table:
+                yield fk
+
+
+async def purge_table(
+    engine: AsyncEngine,
+    table: Table,
+    retention: timedelta,
+    mode: PurgeMode = PurgeMode.ARCHIVE,
+    batch_size: int = 500,
+    pause: float = 0.1,
+    report: Callable[[PurgeStats], None] | None = None,
+) -> PurgeStats:
+    """Purge the expired soft deleted rows of a table, `batch_size` per transaction."""
+    cutoff = current_time() - retention
+    stmt = select(table).where(
+        table.c.is_deleted.is_(True), table.c.deleted_at < cutoff
+    )
+    for fk in _referrers(table):
+        # Aliased, the referrer can be the table itself (parent_id)
+        referrer = fk.parent.table.alias()
+        stmt = stmt.where(~exists().where(referrer.c[fk.parent.name] == fk.column))
+    # Rows locked by a running transaction are left for the next batch
+    stmt = stmt.limit(batch_size).with_for_update(skip_locked=True)
+
+    stats = PurgeStats(table=table.name)
+    start = time.perf_counter()
+    while True:
+        async with engine.begin() as conn:
+            rows = (await conn.execute(stmt)).mappings().all()
+            # Not on a short batch, the rows it deleted can have been the last
+            # referrers of others (parent_id)
+            if not rows:
+                break
+            if mode == PurgeMode.ARCHIVE:
+                archived = [
+                    {
+                        "table_name": table.name,
+                        "id": row["id"],
+                        "data": jsonable_encoder(dict(row)),
+                        "deleted_at": row["deleted_at"],
+                        "archived_at": current_time(),
+                    }
+                    for row in rows
+                ]
+                await conn.execute(insert(ArchivedRow.__table__), archived)
+            ids = [row["id"] for row in rows]
+            await conn.execute(delete(table).where(table.c.id.in_(ids)))
+        stats.rows += len(rows)
+        stats.batches += 1
+        stats.elapsed = time.perf_counter() - start
+        if report is not None:
+            report(stats)
+        # Leave room for the live traffic between the batches
+        await asyncio.sleep(pause)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+async def purge(
+    engine: AsyncEngine,
+    retention: timedelta,
+    mode: PurgeMode = PurgeMode.ARCHIVE,
+    batch_size: int = 500,
+    pause: float = 0.1,
+    tables: list[str] | None = None,
+    report: Callable[[PurgeStats], None] | None = None,
+) -> list[PurgeStats]:
+    """Purge all the soft delete tables (or `tables`), children first."""
+    results = []
+    for table in purgeable_tables():
+        if tables is not None and table.name not in tables:
+            continue
+        results.append(
+            await purge_table(engine, table, retention, mode, batch_size, pause, report)
+        )
+    return results
@@ -1,5 +1,6 @@
 # core/schemas.py
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from sqlalchemy import inspect
 from ulid import ULID
 from datetime import datetime
 
@@ -36,6 +37,29 @@ class ResponseSchema(_BaseSchema):
     model_config = ConfigDict(from_attributes=True)
 
 
+# <- Base for the summary views of list endpoints
+class ProjectionResponse(ResponseSchema):
+    """Response of a projected query (see BaseService.project).
+    The loaded columns that are not declared are returned as extra fields."""
+
+    model_config = ConfigDict(extra="allow")
+
+    @model_validator(mode="before")
+    @classmethod
+    def loaded_columns(cls, data):
+        # Dumping a model instance only reads its loaded columns
+        if isinstance(data, BaseModel):
+            values = data.model_dump()
+            # and leaves out the relationships, the loaded ones are added
+            state = inspect(data, raiseerr=False)
+            if state is not None:
+                for name in state.mapper.relationships.keys():
+                    if name not in state.unloaded:
+                        values[name] = getattr(data, name)
+            return values
+        return data
+
+
 class ULIDPrimaryKeyRequest(RequestSchema):
     id: ULID
 
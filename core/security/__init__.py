@@ -1,7 +1,10 @@
 # core/security/__init__.py
 
 from functools import lru_cache
+from pathlib import Path
+
 from .jwt import JWT
+from .keys import KeySet, SigningKey
 from .crypto import PasswordHasher
 
 
@@ -10,15 +13,37 @@ def get_jwt() -> JWT:
     from core.config import get_settings
 
     settings = get_settings()
+    keys = None
+    if settings.JWT_KEYS:
+        keys = KeySet(
+            tuple(
+                SigningKey.from_pem(
+                    kid=key.kid,
+                    algorithm=key.algorithm,
+                    private_key=_read(key.private_key_file),
+                    public_key=_read(key.public_key_file),
+                    not_before=key.not_before,
+                    not_after=key.not_after,
+                )
+                for key in settings.JWT_KEYS
+            )
+        )
     return JWT(
         secret=settings.SECRET_KEY,
         algorithm=settings.ALGORITHM,
         access_token_expire_minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES,
         refresh_token_expire_minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES,
         verification_token_expire_minutes=settings.VERIFICATION_TOKEN_EXPIRE_MINUTES,
+        cache_size=settings.JWT_CACHE_SIZE,
+        keys=keys,
+        legacy_until=settings.JWT_LEGACY_HS_UNTIL,
     )
 
 
+def _read(path: str | None) -> bytes | None:
+    return Path(path).read_bytes() if path else None
+
+
 @lru_cache()
 def get_pwd_hasher() -> PasswordHasher:
     return PasswordHasher("argon2")
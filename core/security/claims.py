@@ -0,0 +1,65 @@
+# core/security/claims.py
+from typing import Any, NamedTuple
+
+# Bits of `Claims.flags`
+ACTIVE = 1
+VERIFIED = 2
+STAFF = 4
+ADMIN = 8
+
+# Boolean claims of the tokens packed in `Claims.flags`
+_FLAG_CLAIMS = (
+    ("is_active", ACTIVE),
+    ("is_verified", VERIFIED),
+    ("is_staff", STAFF),
+    ("is_admin", ADMIN),
+)
+
+
+class Claims(NamedTuple):
+    """The verified claims of a token, decoded once per token and shared read-only.
+    A tuple (no __dict__, no validation), the boolean claims are packed in the
+    `flags` bitmask.
+    """
+
+    sub: str
+    token_type: str | None
+    exp: int
+    flags: int = 0
+    jti: str | None = None
+    email: str | None = None
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "Claims":
+        flags = 0
+        for claim, flag in _FLAG_CLAIMS:
+            if payload.get(claim):
+                flags |= flag
+        return cls(
+            str(payload["sub"]),
+            payload.get("token_type"),
+            payload["exp"],
+            flags,
+            payload.get("jti"),
+            payload.get("email"),
+        )
+
+    @property
+    def id(self) -> str:
+        return self.sub
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.flags & ACTIVE)
+
+    @property
+    def is_verified(self) -> bool:
+        return bool(self.flags & VERIFIED)
+
+    @property
+    def is_staff(self) -> bool:
+        return bool(self.flags & STAFF)
+
+    @property
+    def is_admin(self) -> bool:
+        return bool(self.flags & ADMIN)
@@ -1,11 +1,24 @@
 # core/security/jwt.py
+import hashlib
+import time
+
 import jwt as _jwt
+from ulid import ULID
 from typing import Literal, Any
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime, UTC, timedelta
 
+from core.cache import LRUCache
+from core.metrics import metrics
+from .claims import Claims
+from .keys import KeySet
+from .exceptions import (
+    InvalidTokenException,
+    ExpiredTokenException,
+    InvalidTokenTypeException,
+)
 
-from .exceptions import InvalidTokenException, ExpiredTokenException
+TokenType = Literal["access", "refresh", "verification"]
 
 
 class TokenUser(BaseModel):
@@ -54,12 +67,23 @@ class JWT:
         access_token_expire_minutes: int = 30,  # 30 minutes
         refresh_token_expire_minutes: int = 60 * 24 * 7,  # 7 days
         verification_token_expire_minutes: int = 5,  # 5 minutes
+        cache_size: int | None = 4096,  # verified tokens, None disables the cache
+        keys: KeySet | None = None,  # asymmetric keys, used instead of the secret
+        # with keys, the tokens signed with the secret are accepted until then
+        legacy_until: datetime | None = None,
     ):
         self.secret = secret
         self.algorithm = algorithm
+        self.keys = keys
+        self.legacy_until = legacy_until
         self.access_token_expire_minutes = access_token_expire_minutes
         self.refresh_token_expire_minutes = refresh_token_expire_minutes
         self.verification_token_expire_minutes = verification_token_expire_minutes
+        # Claims of the verified tokens, keyed by digest and kept until they
+        # expire, so a token used for many requests is verified and parsed once
+        self.cache = LRUCache(maxsize=cache_size) if cache_size else None
+        if self.cache is not None:
+            metrics.gauge("cache.jwt", self.cache.stats)
 
     def access_token(self, data: TokenUser) -> str:
         """
@@ -92,6 +116,32 @@ class JWT:
         payload = self._decode_jwt(token)
         return TokenUser(**payload)
 
+    def claims(self, token: str) -> Claims:
+        """The claims of a valid token, served from the cache once verified."""
+        if self.cache is None:
+            return Claims.from_payload(self._decode_jwt(token))
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        claims = self.cache.get(key)
+        if claims is None:
+            claims = Claims.from_payload(self._decode_jwt(token))
+            expires = claims.exp
+            if self._is_legacy(token):
+                expires = min(expires, self.legacy_until.timestamp())
+            # exp is a unix timestamp, the cache deadlines are monotonic
+            expires_at = time.monotonic() + expires - time.time()
+            self.cache.set(key, claims, expires_at=expires_at)
+        return claims
+
+    def decode_typed(self, token: str, expected_type: TokenType) -> Claims:
+        """
+        Verify the token and its type in one pass, return its claims.
+        Raises ExpiredTokenException, InvalidTokenException or InvalidTokenTypeException.
+        """
+        claims = self.claims(token)
+        if claims.token_type != expected_type:
+            raise InvalidTokenTypeException
+        return claims
+
     def verify(
         self,
         token: str,
@@ -112,12 +162,57 @@ class JWT:
         except ValueError:
             return False
 
+    def jwks(self) -> dict[str, list[dict]]:
+        """The public keys to verify the tokens (JWK Set), the secret is never published."""
+        return self.keys.jwks() if self.keys is not None else {"keys": []}
+
     def _encode_jwt(self, payload: JWTTokenPayload) -> str:
-        return _jwt.encode(payload.model_dump(), self.secret, algorithm=self.algorithm)
+        if self.keys is None:
+            return _jwt.encode(
+                payload.model_dump(), self.secret, algorithm=self.algorithm
+            )
+        key = self.keys.signing_key()
+        return _jwt.encode(
+            payload.model_dump(),
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
+
+    def _is_legacy(self, token: str) -> bool:
+        """Whether a token was signed with the secret while keys are configured."""
+        return (
+            self.keys is not None
+            and self.legacy_until is not None
+            and "kid" not in _jwt.get_unverified_header(token)
+        )
+
+    def _verification_key(self, token: str) -> tuple[Any, str]:
+        """
+        The key and the algorithm of the token, picked by its `kid` header.
+        Tokens without `kid` are signed with the secret (issued before the keys were
+        set), they are accepted until `legacy_until` only.
+        """
+        if self.keys is None:
+            return self.secret, self.algorithm
+        kid = _jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            # Signed with the secret before the switch to the keys
+            if self.legacy_until is None or datetime.now(UTC) >= self.legacy_until:
+                raise InvalidTokenException("Tokens without a key id are not accepted")
+            return self.secret, self.algorithm
+        key = self.keys.verification_key(kid)
+        if key is None:
+            raise InvalidTokenException("Unknown or retired signing key")
+        return key.public_key, key.algorithm
 
     def _decode_jwt(self, token: str) -> dict[str, Any]:
         try:
-            payload = _jwt.decode(token, self.secret, algorithms=[self.algorithm])
+            key, algorithm = self._verification_key(token)
+            # Claims.from_payload needs them, a token without them is invalid
+            payload = _jwt.decode(
+                token, key, algorithms=[algorithm], options={"require": ["sub", "exp"]}
+            )
             return payload
         except _jwt.ExpiredSignatureError:
             raise ExpiredTokenException
@@ -130,7 +225,11 @@ class JWT:
         sub = data.get("id")
         iat = datetime.now(UTC)
         exp = iat + expire_delta
-        payload = JWTTokenPayload.model_construct(sub=sub, iat=iat, exp=exp, **data)
+        # Unique id of the token, to revoke it (apps.auth.revocation)
+        jti = str(ULID())
+        payload = JWTTokenPayload.model_construct(
+            sub=sub, iat=iat, exp=exp, jti=jti, **data
+        )
         return self._encode_jwt(payload)
 
     def _create_access_token(self, data: TokenUser) -> str:
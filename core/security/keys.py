@@ -0,0 +1,95 @@
+# core/security/keys.py
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Literal
+
+from jwt.algorithms import get_default_algorithms, has_crypto
+
+"""
+Asymmetric signing keys, picked by the `kid` header of the tokens.
+A key is published (JWKS) and trusted from its creation, used for signing from
+`not_before` and trusted until `not_after`. To rotate, add the new key with a
+`not_before` later than the JWKS cache max-age, and give the old key a
+`not_after` past the expiry of the last tokens it signed (the refresh tokens).
+"""
+
+KeyAlgorithm = Literal["ES256", "EdDSA"]
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: KeyAlgorithm
+    public_key: Any
+    private_key: Any | None = None  # None for the keys only used for verification
+    not_before: datetime | None = None
+    not_after: datetime | None = None
+
+    @classmethod
+    def from_pem(
+        cls,
+        kid: str,
+        algorithm: KeyAlgorithm,
+        private_key: bytes | None = None,
+        public_key: bytes | None = None,
+        not_before: datetime | None = None,
+        not_after: datetime | None = None,
+    ) -> "SigningKey":
+        """Load a key pair from PEM, the public key is derived from the private key."""
+        if private_key is None and public_key is None:
+            raise ValueError(f"Key {kid} has neither a private nor a public key")
+        if not has_crypto:
+            raise RuntimeError(f"{algorithm} keys require the cryptography package")
+        algo = get_default_algorithms()[algorithm]
+        private = algo.prepare_key(private_key) if private_key else None
+        public = algo.prepare_key(public_key) if public_key else private.public_key()
+        return cls(kid, algorithm, public, private, not_before, not_after)
+
+    def can_sign(self, now: datetime) -> bool:
+        return (
+            self.private_key is not None
+            and (self.not_before is None or self.not_before <= now)
+            and (self.not_after is None or now < self.not_after)
+        )
+
+    def can_verify(self, now: datetime) -> bool:
+        return self.not_after is None or now < self.not_after
+
+    def jwk(self) -> dict[str, Any]:
+        """The public key as a JWK."""
+        jwk = get_default_algorithms()[self.algorithm].to_jwk(
+            self.public_key, as_dict=True
+        )
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+@dataclass(frozen=True)
+class KeySet:
+    keys: tuple[SigningKey, ...]
+    _by_kid: dict[str, SigningKey] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_by_kid", {key.kid: key for key in self.keys})
+
+    def signing_key(self, now: datetime | None = None) -> SigningKey:
+        """The newest key usable for signing."""
+        now = now or datetime.now(UTC)
+        usable = [key for key in self.keys if key.can_sign(now)]
+        if not usable:
+            raise LookupError("No signing key is active")
+        return max(
+            usable, key=lambda key: key.not_before or datetime.min.replace(tzinfo=UTC)
+        )
+
+    def verification_key(
+        self, kid: str, now: datetime | None = None
+    ) -> SigningKey | None:
+        key = self._by_kid.get(kid)
+        if key is None or not key.can_verify(now or datetime.now(UTC)):
+            return None
+        return key
+
+    def jwks(self, now: datetime | None = None) -> dict[str, list[dict]]:
+        """The JWK Set of the trusted keys, including the ones not signing yet."""
+        now = now or datetime.now(UTC)
+        return {"keys": [key.jwk() for key in self.keys if key.can_verify(now)]}
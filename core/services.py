@@ -1,11 +1,50 @@
 # core/services.py
 
+import asyncio
+import copy
 from enum import StrEnum
-from typing import TypeVar, Type, Generic, Any
+from itertools import batched
+from typing import (
+    TypeVar,
+    Type,
+    Generic,
+    Any,
+    AsyncIterator,
+    Iterable,
+    NamedTuple,
+    Sequence,
+)
+from sqlalchemy import (
+    Row,
+    Table,
+    bindparam,
+    delete as sa_delete,
+    event,
+    inspect as sa_inspect,
+    insert,
+    select as sa_select,
+    text,
+    update as sa_update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from pydantic import BaseModel
 from sqlmodel import SQLModel, select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
+from core.cache import LRUCache
+from core.database import (
+    mark_pending_writes,
+    release_connection,
+    PENDING_WRITES,
+    UNIT_OF_WORK,
+)
 from core.exceptions import BaseServiceException
+from core.metrics import metrics
+from core.pagination import CursorPage, decode_cursor, encode_cursor
 from utils.time import current_time
 
 T = TypeVar("T", bound=SQLModel)
@@ -16,6 +55,19 @@ class DeleteMode(StrEnum):
     HARD = "hard"
 
 
+class TotalMode(StrEnum):
+    EXACT = "exact"  # SELECT count(*)
+    ESTIMATED = "estimated"  # planner statistics, Postgres only
+    CACHED = "cached"  # exact count cached until a write through BaseService
+
+
+class Total(NamedTuple):
+    """A row count and how it was obtained."""
+
+    value: int
+    mode: TotalMode
+
+
 class ResourceNotFoundException(BaseServiceException):
     """Exception raised when a resource is not found."""
 
@@ -23,6 +75,22 @@ class ResourceNotFoundException(BaseServiceException):
         super().__init__(f"{resource} with identifier '{identifier}' not found.")
 
 
+class InvalidFieldsException(BaseServiceException):
+    """Exception raised when a projection names fields that are not columns."""
+
+    def __init__(self, model: Type[SQLModel], fields: Iterable[str]):
+        super().__init__(
+            f"Unknown fields {', '.join(sorted(fields))} for model '{model.__name__}'."
+        )
+
+
+class UpsertNotSupportedException(BaseServiceException):
+    """Exception raised when the database dialect has no INSERT ... ON CONFLICT."""
+
+    def __init__(self, dialect: str):
+        super().__init__(f"Upsert is not supported on '{dialect}'.")
+
+
 class SoftDeleteNotSupportedException(BaseServiceException):
     """Exception raised when soft delete is not supported for a model."""
 
@@ -30,6 +98,168 @@ class SoftDeleteNotSupportedException(BaseServiceException):
         super().__init__(f"Soft delete is not supported for model '{model.__name__}'.")
 
 
+# ------------------------------------------
+# Fast path lookups
+# One prebuilt Core statement per (table, column), shared by all the services.
+# Reusing the same statement object keeps its cache key and compiled SQL in
+# SQLAlchemy's compiled cache, and the identical SQL string lets asyncpg reuse
+# its prepared statement. Rows are returned as is, without ORM hydration.
+# ------------------------------------------
+_row_lookups: dict[tuple[Table, str, bool], Select] = {}
+
+
+def _row_lookup(table: Table, column: str, live: bool = False) -> Select:
+    stmt = _row_lookups.get((table, column, live))
+    if stmt is None:
+        stmt = sa_select(table).where(table.c[column] == bindparam("value"))
+        if live:
+            stmt = stmt.where(table.c.is_deleted.is_(False))
+        _row_lookups[(table, column, live)] = stmt
+    return stmt
+
+
+# ------------------------------------------
+# Totals
+# ------------------------------------------
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, for the planner row estimates."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+# Cached counts are keyed on the write generation of their table, every write
+# through BaseService bumps it so the stale entries are never read again.
+# Planner row count of a table (`:t::regclass` would not be parsed as a bind)
+RELTUPLES = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:t AS regclass)"
+)
+
+COUNT_CACHE_TTL = 60  # seconds, bounds staleness from writes outside BaseService
+_count_cache = LRUCache(maxsize=1024, ttl=COUNT_CACHE_TTL)
+_write_generations: dict[str, int] = {}
+
+metrics.gauge("cache.counts.hit_rate", lambda: _count_cache.stats()["hit_rate"])
+
+
+# ------------------------------------------
+# Identity cache
+# Opt-in per service (cache_ttl), one LRU per model shared by the services.
+# Entries are snapshots of the column values keyed by ("id", id), lookups on
+# other unique columns are keyed by (column, value) and point to the id.
+# Writes through BaseService evict the entries, once when written and again
+# when their transaction ends, so a row read (and cached) by another session in
+# between does not stay stale. Writes made elsewhere (or in other processes)
+# are seen after the TTL. Nothing is cached while the session holds writes that
+# are not committed yet.
+# ------------------------------------------
+_identity_caches: dict[str, LRUCache] = {}
+
+# Session.info key of the entries to evict again when the transaction ends,
+# (table, id) pairs, id None for the whole table
+EVICTIONS = "identity_evictions"
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _evict_after_transaction(session, transaction) -> None:
+    if transaction.parent is not None:
+        return
+    for table, id_ in session.info.pop(EVICTIONS, ()):
+        cache = _identity_caches.get(table)
+        if cache is None:
+            continue
+        if id_ is None:
+            cache.clear()
+        else:
+            cache.pop(("id", id_))
+
+
+def _copy_values(values: dict[str, Any]) -> dict[str, Any]:
+    # Mutable (JSON) values are copied, so the cached ones cannot be changed
+    return {
+        k: copy.deepcopy(v) if isinstance(v, (dict, list)) else v
+        for k, v in values.items()
+    }
+
+
+# ------------------------------------------
+# Batch loading
+# ------------------------------------------
+
+# Session.info key of the batch loaders of a session, one per model
+LOADERS = "loaders"
+# Session.info key of the lock the batch loaders of a session dispatch under
+LOADER_LOCK = "loader_lock"
+
+
+class BatchLoader(Generic[T]):
+    """Collects the by-id lookups made during one event loop tick and resolves
+    them with one `WHERE id IN (...)` query (see BaseService.load).
+
+    Lookups awaited together (asyncio.gather) share a query, sequential awaits
+    do not. Results are memoized for the life of the loader (the session).
+    """
+
+    def __init__(self, service: "BaseService[T]"):
+        self.service = service
+        self._futures: dict[str, asyncio.Future] = {}
+        self._queue: list[str] = []
+        # A session runs one statement at a time, the batches of all its
+        # loaders are dispatched one after the other
+        self._lock = service.session.info.setdefault(LOADER_LOCK, asyncio.Lock())
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, id_: str) -> asyncio.Future:
+        future = self._futures.get(id_)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[id_] = loop.create_future()
+            if not self._queue:
+                # Starts after the callbacks already scheduled in this tick
+                task = loop.create_task(self._dispatch())
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            self._queue.append(id_)
+        return future
+
+    async def _dispatch(self) -> None:
+        ids, self._queue = self._queue, []
+        try:
+            async with self._lock:
+                found = await self.service.get_by_ids(ids)
+        except Exception as e:
+            for id_ in ids:
+                self._futures.pop(id_).set_exception(e)
+            return
+        for id_ in ids:
+            self._futures[id_].set_result(found.get(id_))
+
+    def clear(self, id_: str | None = None) -> None:
+        """Forget a memoized result, or all of them."""
+        if id_ is None:
+            self._futures = {k: f for k, f in self._futures.items() if not f.done()}
+        elif id_ in self._futures and self._futures[id_].done():
+            del self._futures[id_]
+
+
+# ------------------------------------------
+# Bulk writes
+# Rows are sent in batches of BULK_BATCH_SIZE, as one multi-row statement each.
+# Above COPY_THRESHOLD rows, inserts on Postgres (asyncpg) use COPY instead.
+# ------------------------------------------
+BULK_BATCH_SIZE = 1000
+COPY_THRESHOLD = 10_000
+
+
 class BaseService(Generic[T]):
     def __init__(
         self,
@@ -41,30 +271,294 @@ class BaseService(Generic[T]):
         self.model = model
         self.delete_mode = delete_mode
 
+    # Soft deleted rows are left out of the queries, see including_deleted()
+    include_deleted: bool = False
+
+    @property
+    def scoped(self) -> bool:
+        """Whether the queries leave the soft deleted rows out."""
+        return not self.include_deleted and "is_deleted" in self.model.__table__.c
+
+    def including_deleted(self) -> "BaseService[T]":
+        """A copy of the service whose queries return the soft deleted rows too."""
+        service = copy.copy(self)
+        service.include_deleted = True
+        return service
+
+    def scope(self, stmt: Select) -> Select:
+        """Leave the soft deleted rows out of a query, unless including them."""
+        if self.scoped:
+            stmt = stmt.where(self.model.is_deleted.is_(False))
+        return stmt
+
+    # Second level identity cache of get_by_id, off unless a service sets a TTL
+    cache_ttl: float | None = None
+    cache_maxsize: int = 1024
+
+    @property
+    def identity_cache(self) -> LRUCache | None:
+        if self.cache_ttl is None:
+            return None
+        table = self.model.__tablename__
+        cache = _identity_caches.get(table)
+        if cache is None:
+            cache = LRUCache(maxsize=self.cache_maxsize, ttl=self.cache_ttl)
+            _identity_caches[table] = cache
+            metrics.gauge(f"cache.identity.{table}", cache.stats)
+        return cache
+
+    def _cache_instance(self, instance: T) -> bool:
+        """Cache the values of a row, unless they may not be committed."""
+        session = self.session
+        if session.info.get(PENDING_WRITES) or session.new or session.dirty:
+            return False
+        values = {c.key: getattr(instance, c.key) for c in self.model.__table__.columns}
+        self.identity_cache.set(("id", instance.id), _copy_values(values))
+        return True
+
+    async def _cached_instance(self, id_: str) -> T | None:
+        """Attach the cached snapshot of a row to the session, without a query.
+
+        An instance already in the session is returned as is when it is loaded or
+        changed, it may hold changes that are not flushed yet. Expired ones are
+        refreshed from the cache.
+        """
+        live = self.session.sync_session.identity_map.get(identity_key(self.model, id_))
+        if live is not None:
+            state = sa_inspect(live)
+            if state.modified or state.unloaded.isdisjoint(
+                self.model.__table__.c.keys()
+            ):
+                return None if self.scoped and live.is_deleted else live
+        values = self.identity_cache.get(("id", id_))
+        if values is None or (self.scoped and values["is_deleted"]):
+            return None
+        instance = self.model(**_copy_values(values))
+        make_transient_to_detached(instance)
+        return await self.session.merge(instance, load=False)
+
+    def evict(self, instance: T | None = None) -> None:
+        """Drop a row from the identity cache, or all the rows without `instance`."""
+        for (model, _), loader in self.session.info.get(LOADERS, {}).items():
+            if model is self.model:
+                loader.clear(None if instance is None else instance.id)
+        cache = self.identity_cache
+        if cache is None:
+            return
+        if instance is None:
+            cache.clear()
+        else:
+            cache.pop(("id", instance.id))
+        if self.session.in_transaction():
+            self.session.info.setdefault(EVICTIONS, set()).add(
+                (self.model.__tablename__, None if instance is None else instance.id)
+            )
+
+    @property
+    def unit_of_work(self) -> bool:
+        """Whether the session is in unit of work mode (flush only, no commit)."""
+        return self.session.info.get(UNIT_OF_WORK, False)
+
+    async def save(self, instance: T | None = None) -> None:
+        """Flush in unit of work mode, commit otherwise.
+
+        Server generated values come back with RETURNING (eager_defaults), the
+        instance is only refreshed on dialects that do not support it.
+        """
+        self.invalidate()
+        if self.unit_of_work:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+        if (
+            instance is not None
+            and not self.session.get_bind().dialect.insert_returning
+        ):
+            await self.session.refresh(instance)
+
+    def invalidate(self) -> None:
+        """Called on every write, drops the cached counts of the table."""
+        table = self.model.__tablename__
+        _write_generations[table] = _write_generations.get(table, 0) + 1
+
+    async def release(self) -> None:
+        """Give the connection back to the pool if the session only read."""
+        await release_connection(self.session)
+
     async def get_by_id(self, id_: str) -> T | None:
-        stmt = select(self.model).where(self.model.id == id_)
+        cache = self.identity_cache
+        if cache is not None:
+            instance = await self._cached_instance(id_)
+            if instance is not None:
+                return instance
+        stmt = self.scope(select(self.model).where(self.model.id == id_))
         result = await self.session.exec(stmt)
-        return result.one_or_none()
+        instance = result.one_or_none()
+        await self.release()
+        if cache is not None and instance is not None:
+            self._cache_instance(instance)
+        return instance
+
+    async def get_by_ids(self, ids: Iterable[str]) -> dict[str, T]:
+        """Instances by id, with one IN query for the ids not in the cache."""
+        found = {}
+        cache = self.identity_cache
+        missing = []
+        for id_ in dict.fromkeys(ids):
+            instance = await self._cached_instance(id_) if cache is not None else None
+            if instance is None:
+                missing.append(id_)
+            else:
+                found[id_] = instance
+        for batch in batched(missing, BULK_BATCH_SIZE):
+            stmt = self.scope(select(self.model).where(self.model.id.in_(batch)))
+            result = await self.session.exec(stmt)
+            for instance in result.all():
+                found[instance.id] = instance
+                if cache is not None:
+                    self._cache_instance(instance)
+        if missing:
+            await self.release()
+        return found
+
+    @property
+    def loader(self) -> BatchLoader[T]:
+        """The batch loader of the model, shared by the services of the session."""
+        loaders = self.session.info.setdefault(LOADERS, {})
+        key = (self.model, self.include_deleted)
+        loader = loaders.get(key)
+        if loader is None:
+            loader = loaders[key] = BatchLoader(self)
+        return loader
+
+    async def load(self, id_: str) -> T | None:
+        """Batched `get_by_id`, for resolving many ids concurrently:
+
+        pages = await asyncio.gather(*(service.load(i.page_id) for i in items))
+        """
+        return await self.loader.load(id_)
+
+    async def load_many(self, ids: Iterable[str]) -> list[T | None]:
+        return list(await asyncio.gather(*(self.load(id_) for id_ in ids)))
+
+    async def get_row_by(self, column: str, value: Any) -> Row | None:
+        """Read-only lookup by a (unique) column, returns a Row, not a model instance.
+
+        Rows support attribute access, so they can be returned from endpoints with
+        `from_attributes` response schemas. Use the ORM methods to modify data.
+        """
+        stmt = _row_lookup(self.model.__table__, column, live=self.scoped)
+        result = await self.session.exec(stmt, params={"value": value})
+        row = result.first()
+        await self.release()
+        return row
+
+    async def get_row_by_id(self, id_: str) -> Row | None:
+        """Read-only fast path of `get_by_id`."""
+        return await self.get_row_by("id", id_)
+
+    def _unique_key(self, kwargs: dict[str, Any]) -> tuple[str, Any] | None:
+        """Cache key of a filter_by on a single unique column, if it is one."""
+        if len(kwargs) != 1:
+            return None
+        ((column, value),) = kwargs.items()
+        if column == "id":
+            return None
+        c = self.model.__table__.c.get(column)
+        return (column, value) if c is not None and c.unique else None
 
     async def filter_by(self, **kwargs) -> list[T]:
-        stmt = select(self.model).filter_by(**kwargs)
+        cache = self.identity_cache
+        key = self._unique_key(kwargs) if cache is not None else None
+        if key is not None:
+            id_ = cache.get(key)
+            if id_ is not None:
+                instance = await self._cached_instance(id_)
+                # The column may have changed since, the snapshot tells
+                if instance is not None and getattr(instance, key[0]) == key[1]:
+                    return [instance]
+        stmt = self.scope(select(self.model).filter_by(**kwargs))
         result = await self.session.exec(stmt)
-        return result.all()
+        items = result.all()
+        await self.release()
+        if key is not None and len(items) == 1 and self._cache_instance(items[0]):
+            cache.set(key, items[0].id)
+        return items
 
-    async def get_all(self) -> list[T]:
-        stmt = select(self.model)
+    def project(
+        self,
+        stmt: Select | None = None,
+        fields: Iterable[str] | type[BaseModel] | None = None,
+    ) -> Select:
+        """Load only some columns of the model, given by name or by a schema.
+
+        The id is always loaded. The other columns are not loaded and raise on
+        access, instead of lazy loading one row at a time. `None` loads them all.
+        """
+        if stmt is None:
+            stmt = select(self.model)
+        if fields is None:
+            return stmt
+        columns = self.model.__table__.columns
+        if isinstance(fields, type):
+            # Schemas may declare computed fields, only the columns are loaded
+            fields = [f for f in fields.model_fields if f in columns]
+        # Relationships are resolved by the services, not loaded with the columns
+        fields = {"id", *fields} - set(self.model.__mapper__.relationships.keys())
+        unknown = fields - set(columns.keys())
+        if unknown:
+            raise InvalidFieldsException(self.model, unknown)
+        attributes = [getattr(self.model, f) for f in fields]
+        return stmt.options(load_only(*attributes, raiseload=True))
+
+    async def get_all(
+        self,
+        stmt: Select | None = None,
+        fields: Iterable[str] | type[BaseModel] | None = None,
+    ) -> list[T]:
+        stmt = self.scope(self.project(stmt, fields))
         result = await self.session.exec(stmt)
-        return result.all()
+        items = result.all()
+        await self.release()
+        return items
+
+    async def stream(
+        self,
+        stmt: Select | None = None,
+        chunk_size: int = 500,
+        fields: Iterable[str] | type[BaseModel] | None = None,
+    ) -> AsyncIterator[T]:
+        """Iterate over the results with a server side cursor.
+
+        Rows are fetched and hydrated `chunk_size` at a time, so memory stays flat
+        whatever the size of the result. The connection is held until the
+        iteration ends, use a session dedicated to the stream.
+        """
+        stmt = self.scope(self.project(stmt, fields))
+        stmt = stmt.execution_options(yield_per=chunk_size)
+        result = await self.session.stream_scalars(stmt)
+        try:
+            async for item in result:
+                yield item
+        finally:
+            await result.close()
+            await self.release()
 
     async def count(self, stmt: Select | None = None) -> int:
-        stmt = stmt or select(func.count()).select_from(self.model)
+        if stmt is None:
+            stmt = self.scope(select(func.count()).select_from(self.model))
         result = await self.session.exec(stmt)
-        return result.one()
+        total = result.one()
+        await self.release()
+        return total
 
     async def exists(self, **kwargs) -> bool:
-        stmt = select(func.count()).select_from(self.model).filter_by(**kwargs)
+        stmt = self.scope(select(func.count()).select_from(self.model))
+        stmt = stmt.filter_by(**kwargs)
         result = await self.session.exec(stmt)
-        return result.one() > 0
+        found = result.one() > 0
+        await self.release()
+        return found
 
     async def paginate(
         self,
@@ -72,27 +566,120 @@ class BaseService(Generic[T]):
         page: int = 1,
         page_size: int = 20,
         order_by: list | None = None,
+        fields: Iterable[str] | type[BaseModel] | None = None,
     ) -> list[T]:
         offset = (page - 1) * page_size
-        stmt = (stmt or select(self.model)).offset(offset).limit(page_size)
+        stmt = self.scope(self.project(stmt, fields)).offset(offset).limit(page_size)
         if order_by:
             stmt = stmt.order_by(*order_by)
         result = await self.session.exec(stmt)
-        return result.all()
+        items = result.all()
+        await self.release()
+        return items
 
-    async def paginate_with_total(
+    async def paginate_cursor(
         self,
         stmt: Select | None = None,
-        page: int = 1,
-        page_size: int = 20,
-    ) -> tuple[int, list[T]]:
+        cursor: str | None = None,
+        limit: int = 20,
+        fields: Iterable[str] | type[BaseModel] | None = None,
+    ) -> CursorPage[T]:
+        """Keyset pagination on the (time ordered ULID) primary key.
+
+        Seeks with `WHERE id > :after` (or `id < :before` for a previous page
+        cursor) instead of an OFFSET, so every page costs the same.
+        """
+        direction, boundary = decode_cursor(cursor) if cursor else ("next", None)
+        stmt = self.scope(self.project(stmt, fields))
+        if direction == "next":
+            if boundary is not None:
+                stmt = stmt.where(self.model.id > boundary)
+            stmt = stmt.order_by(self.model.id)
+        else:
+            stmt = stmt.where(self.model.id < boundary).order_by(self.model.id.desc())
+        # One extra row tells whether there is another page in that direction
+        result = await self.session.exec(stmt.limit(limit + 1))
+        items = list(result.all())
+        await self.release()
+        has_more = len(items) > limit
+        items = items[:limit]
+        if direction == "prev":
+            items.reverse()
+
+        page = CursorPage(items=items)
+        if items:
+            if direction == "next":
+                has_next, has_prev = has_more, boundary is not None
+            else:
+                has_next, has_prev = True, has_more
+            if has_next:
+                page.next_cursor = encode_cursor(items[-1].id, "next")
+            if has_prev:
+                page.prev_cursor = encode_cursor(items[0].id, "prev")
+        return page
+
+    async def count_total(
+        self, stmt: Select | None = None, mode: TotalMode = TotalMode.EXACT
+    ) -> Total:
+        """Count the rows of `stmt` (or of the table), exactly or cheaply.
+
+        ESTIMATED falls back to an exact count on other dialects than Postgres
+        and on tables that were never analyzed, the returned mode tells which
+        one was used.
+        """
+        if stmt is not None or self.scoped:
+            stmt = self.scope(stmt if stmt is not None else select(self.model))
         count_stmt = (
             select(func.count()).select_from(self.model)
             if stmt is None
             else select(func.count()).select_from(stmt.subquery())
         )
-        total = await self.count(count_stmt)
-        items = await self.paginate(stmt, page=page, page_size=page_size)
+        if mode == TotalMode.ESTIMATED:
+            estimate = await self._estimate(stmt)
+            if estimate is not None:
+                return Total(estimate, TotalMode.ESTIMATED)
+        elif mode == TotalMode.CACHED:
+            table = self.model.__tablename__
+            compiled = count_stmt.compile()
+            key = (
+                table,
+                _write_generations.get(table, 0),
+                str(compiled),
+                repr(sorted(compiled.params.items())),
+            )
+            cached = _count_cache.get(key)
+            if cached is None:
+                cached = await self.count(count_stmt)
+                _count_cache.set(key, cached)
+            return Total(cached, TotalMode.CACHED)
+        return Total(await self.count(count_stmt), TotalMode.EXACT)
+
+    async def _estimate(self, stmt: Select | None) -> int | None:
+        """Planner row estimate, None when not available."""
+        if self.session.get_bind().dialect.name != "postgresql":
+            return None
+        if stmt is None:
+            result = await self.session.exec(
+                RELTUPLES, params={"t": self.model.__tablename__}
+            )
+            estimate = result.scalar()
+        else:
+            result = await self.session.exec(Explain(stmt))
+            estimate = result.scalar()[0]["Plan"]["Plan Rows"]
+        await self.release()
+        # reltuples is -1 on tables that were never vacuumed/analyzed
+        return int(estimate) if estimate is not None and estimate >= 0 else None
+
+    async def paginate_with_total(
+        self,
+        stmt: Select | None = None,
+        page: int = 1,
+        page_size: int = 20,
+        total_mode: TotalMode = TotalMode.EXACT,
+        fields: Iterable[str] | type[BaseModel] | None = None,
+    ) -> tuple[Total, list[T]]:
+        total = await self.count_total(stmt, total_mode)
+        items = await self.paginate(stmt, page=page, page_size=page_size, fields=fields)
         return total, items
 
     async def create(self, data: dict[str, Any] | SQLModel) -> T:
@@ -102,8 +689,7 @@ class BaseService(Generic[T]):
         else:
             instance = data
         self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        await self.save(instance)
         return instance
 
     async def update(self, instance: T, data: dict[str, Any]) -> T:
@@ -114,8 +700,8 @@ class BaseService(Generic[T]):
         if hasattr(instance, "updated_at"):
             instance.updated_at = current_time()
         self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
+        await self.save(instance)
+        self.evict(instance)
         return instance
 
     async def update_by_id(self, id_: str, data: dict[str, Any]) -> T:
@@ -131,10 +717,12 @@ class BaseService(Generic[T]):
             if not hasattr(instance, "is_deleted"):
                 raise SoftDeleteNotSupportedException(self.model)
             instance.is_deleted = True
+            instance.deleted_at = current_time()
             self.session.add(instance)
         elif self.delete_mode == DeleteMode.HARD:
             await self.session.delete(instance)
-        await self.session.commit()
+        await self.save()
+        self.evict(instance)
 
     async def delete_by_id(self, id_: str) -> T:
         """Delete a model instance by ID."""
@@ -144,5 +732,189 @@ class BaseService(Generic[T]):
         await self.delete(instance)
         return instance
 
+    # ------------------------------------------
+    # Bulk operations
+    # These bypass the ORM unit of work: no instances are loaded, refreshed or
+    # kept in the session, and the instances already in it are not updated.
+    # All the batches run in one transaction, committed at the end (or left to
+    # the owner of the session in unit of work mode).
+    # ------------------------------------------
+
+    def _to_row(self, data: dict[str, Any] | SQLModel) -> dict[str, Any]:
+        # Building the model applies the ULID and timestamp default factories
+        instance = self.model(**data) if isinstance(data, dict) else data
+        return {c.key: getattr(instance, c.key) for c in self.model.__table__.columns}
+
+    @staticmethod
+    def _given_fields(data: dict[str, Any] | SQLModel) -> set[str]:
+        """The fields the caller passed, the others only hold model defaults."""
+        return set(data) if isinstance(data, dict) else set(data.model_fields_set)
+
+    async def bulk_create(
+        self,
+        items: Iterable[dict[str, Any] | SQLModel],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> list[str]:
+        """Insert many rows at once, returning their ids."""
+        rows = [self._to_row(item) for item in items]
+        if not rows:
+            return []
+        bind = self.session.get_bind()
+        if len(rows) >= COPY_THRESHOLD and bind.dialect.driver == "asyncpg":
+            await self._copy(rows)
+        else:
+            table = self.model.__table__
+            for batch in batched(rows, batch_size):
+                await self.session.exec(insert(table), params=list(batch))
+        await self.save()
+        return [row["id"] for row in rows]
+
+    async def _copy(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows with COPY ... FROM STDIN through the asyncpg connection."""
+        connection = await self.session.connection()
+        # asyncpg begins the transaction on the first statement, start it now so
+        # the COPY is part of it
+        await connection.exec_driver_sql("SELECT 1")
+        raw = await connection.get_raw_connection()
+        columns = list(rows[0])
+        # COPY skips the SQLAlchemy types, serialize the values (JSON) like a bind
+        table = self.model.__table__
+        processors = [
+            table.c[c].type.bind_processor(connection.dialect) for c in columns
+        ]
+        records = [
+            tuple(
+                p(row[c]) if p and row[c] is not None else row[c]
+                for c, p in zip(columns, processors)
+            )
+            for row in rows
+        ]
+        await raw.driver_connection.copy_records_to_table(
+            self.model.__tablename__, records=records, columns=columns
+        )
+        mark_pending_writes(self.session)
+
+    def _upsert_statement(
+        self,
+        target,
+        conflict_on: Sequence[str],
+        update: Sequence[str] | None,
+        columns: Iterable[str],
+    ):
+        """INSERT ... ON CONFLICT (conflict_on) DO UPDATE SET the `update` columns.
+
+        `update=None` updates the `columns` the caller gave but the id, created_at
+        and the conflict keys, an empty `update` does nothing on conflict. An
+        updated row that was soft deleted is restored.
+        """
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(target)
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(target)
+        else:
+            raise UpsertNotSupportedException(dialect)
+        if update is None:
+            skip = {"id", "created_at", *conflict_on}
+            update = [c for c in columns if c not in skip]
+        if not update:
+            return stmt.on_conflict_do_nothing(index_elements=conflict_on)
+        set_ = {c: stmt.excluded[c] for c in update}
+        for column in ("updated_at", "is_deleted", "deleted_at"):
+            if column in self.model.__table__.c:
+                set_[column] = stmt.excluded[column]
+        return stmt.on_conflict_do_update(index_elements=conflict_on, set_=set_)
+
+    async def upsert(
+        self,
+        data: dict[str, Any] | SQLModel,
+        conflict_on: Sequence[str],
+        update: Sequence[str] | None = None,
+    ) -> T | None:
+        """Insert a row, or update the row it conflicts with, in one statement.
+
+        `conflict_on` are the columns of a unique index (e.g. ["slug"]). Returns
+        the inserted or updated instance, None if nothing was done (empty `update`).
+        """
+        row = self._to_row(data)
+        stmt = self._upsert_statement(
+            self.model, conflict_on, update, self._given_fields(data)
+        )
+        result = await self.session.exec(
+            stmt.values(row).returning(self.model),
+            execution_options={"populate_existing": True},
+        )
+        instance = result.scalars().one_or_none()
+        await self.save()
+        self.evict()
+        return instance
+
+    async def bulk_upsert(
+        self,
+        items: Iterable[dict[str, Any] | SQLModel],
+        conflict_on: Sequence[str],
+        update: Sequence[str] | None = None,
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> None:
+        """Batched `upsert`, without returning the rows.
+
+        With `update=None`, only the fields given by every item are updated.
+        """
+        items = list(items)
+        if not items:
+            return
+        rows = [self._to_row(item) for item in items]
+        given = set.intersection(*(self._given_fields(item) for item in items))
+        stmt = self._upsert_statement(self.model.__table__, conflict_on, update, given)
+        for batch in batched(rows, batch_size):
+            await self.session.exec(stmt, params=list(batch))
+        await self.save()
+        self.evict()
+
+    async def bulk_update(
+        self,
+        rows: Iterable[dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> None:
+        """Update many rows by primary key, each dict holds the `id` and new values.
+
+        `updated_at` is set to the current time unless given.
+        """
+        now = current_time()
+        rows = [{"updated_at": now, **row} for row in rows]
+        for batch in batched(rows, batch_size):
+            # ORM bulk UPDATE by primary key, run as executemany
+            await self.session.exec(sa_update(self.model), params=list(batch))
+        await self.save()
+        self.evict()
+
+    async def bulk_delete(
+        self, ids: Sequence[str], batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """Delete many rows by id according to the delete mode.
+
+        Soft deletes skip the rows already deleted, so their `deleted_at` is kept.
+        Returns the number of rows deleted.
+        """
+        table = self.model.__table__
+        if self.delete_mode == DeleteMode.SOFT:
+            if "is_deleted" not in table.c:
+                raise SoftDeleteNotSupportedException(self.model)
+            now = current_time()
+            base = (
+                sa_update(table)
+                .where(table.c.is_deleted.is_(False))
+                .values(is_deleted=True, deleted_at=now, updated_at=now)
+            )
+        else:
+            base = sa_delete(table)
+        deleted = 0
+        for batch in batched(ids, batch_size):
+            result = await self.session.exec(base.where(table.c.id.in_(batch)))
+            deleted += result.rowcount
+        await self.save()
+        self.evict()
+        return deleted
+
     def __repr__(self):
         return f"<{self.__class__.__name__} model={self.model.__name__}>"
@@ -0,0 +1,57 @@
+# core/streaming.py
+"""
+Streaming responses for large listings.
+Clients that send `Accept: application/x-ndjson` get one JSON document per line,
+written as the rows come out of a server side cursor (BaseService.stream),
+instead of the whole list serialized into one body.
+The response body is sent after the request dependencies exited, so the rows
+are read with a session of their own, opened from the session factory.
+A stream outlives the request deadline, it gets STREAM_DEADLINE instead.
+"""
+
+from typing import AsyncIterator, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.database import get_deadline
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    session_factory: async_sessionmaker[AsyncSession],
+    service_class: Callable,
+    schema: type[BaseModel],
+    stmt: Select | None = None,
+    fields: list[str] | None = None,
+    chunk_size: int = 500,
+) -> StreamingResponse:
+    """Stream the results of `stmt` as NDJSON, `chunk_size` lines per write."""
+    from core.config import get_settings
+
+    # The body is sent within the request deadline, a large stream outlives it
+    if (deadline := get_deadline()) is not None:
+        deadline.reschedule(get_settings().STREAM_DEADLINE)
+
+    async def lines() -> AsyncIterator[str]:
+        async with session_factory() as session:
+            service = service_class(session=session)
+            chunk = []
+            async for item in service.stream(stmt, chunk_size, fields=fields):
+                chunk.append(schema.model_validate(item).model_dump_json())
+                if len(chunk) == chunk_size:
+                    yield "\n".join(chunk) + "\n"
+                    chunk = []
+            if chunk:
+                yield "\n".join(chunk) + "\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON)
@@ -0,0 +1,82 @@
+# core/warmup.py
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from utils.logging import logger
+
+"""
+Startup warm-up, run by the app lifespan before the worker reports ready.
+The first requests to a new worker would otherwise pay for connection setup,
+asyncpg type introspection, statement compilation and preparation, the
+OpenAPI schema and the argon2 backend initialisation.
+A failed warm-up is retried in the background, the worker reports ready once
+one of the attempts succeeds.
+"""
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` connections at once, they stay in the pool afterwards."""
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+async def prime_statements(session_factory: async_sessionmaker) -> None:
+    """Compile (and prepare) the hot lookup statements."""
+    from apps.users.services import UserService
+    from apps.cms.services.page import PageService
+    from apps.cms.services.post import PostService
+
+    async with session_factory() as session:
+        users = UserService(session=session)
+        await users.get_row_by_id("")
+        await users.get_user_row_by_email("warm-up@localhost")
+        await PageService(session=session).get_row_by("slug", "")
+        await PostService(session=session).get_row_by("slug", "")
+
+
+def prime_app(app: FastAPI) -> None:
+    """Build the OpenAPI schema and initialise the password hasher backend."""
+    from core.security import get_pwd_hasher
+
+    app.openapi()
+    get_pwd_hasher().hash("warm-up")
+
+
+async def warm_up(app: FastAPI) -> None:
+    from core.config import get_settings
+    from core.database import get_async_engine, get_async_sessionmaker, get_replicas
+
+    start = time.perf_counter()
+    connections = get_settings().DATABASE_WARMUP_CONNECTIONS
+    engines = [get_async_engine()]
+    if replicas := get_replicas():
+        engines.extend(replicas.engines)
+    for engine in engines:
+        await warm_up_pool(engine, connections)
+    await prime_statements(get_async_sessionmaker())
+    prime_app(app)
+    logger.info(f"Warm-up done in {time.perf_counter() - start:.2f}s")
+
+
+async def retry_warm_up(
+    app: FastAPI, delay: float = 1.0, max_delay: float = 60.0
+) -> None:
+    """Warm up until it succeeds then report ready, meant to run as a background task."""
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            await warm_up(app)
+        except Exception as e:
+            delay = min(delay * 2, max_delay)
+            logger.error(f"Warm-up failed, retrying in {delay:.0f}s: {e}")
+            continue
+        app.state.ready = True
+        return
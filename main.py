@@ -1,12 +1,29 @@
 # main.py
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
 from utils.version import get_version
-from utils.logging import setup_logging
-from apps.auth.endpoints import router as auth_router
+from utils.logging import setup_logging, logger
+from apps.auth.endpoints import router as auth_router, well_known_router
+from apps.auth.revocation import get_revocations
 from apps.users.endpoints import router as users_router
 from apps.cms.endpoints import router as cms_router
-from apps.uploads.endpoints import router as uploads_router
+from apps.uploads.endpoints import UPLOADS_DEADLINE, router as uploads_router
+from core.config import get_settings
+from core.database import (
+    init_engine,
+    dispose_engine,
+    get_async_sessionmaker,
+    get_replicas,
+    QueryBudgetExceededException,
+)
+from core.metrics import metrics
+from core.middleware import QueryBudgetMiddleware, DeadlineMiddleware
+from core.warmup import retry_warm_up, warm_up
 
 
 # ------------------------------------------
@@ -15,6 +32,52 @@ from apps.uploads.endpoints import router as uploads_router
 setup_logging()
 
 
+# ------------------------------------------
+# Lifespan
+# ------------------------------------------
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    _app.state.ready = False
+    # One engine (connection pool) per worker process
+    init_engine()
+    replicas = get_replicas()
+    monitor = None
+    if replicas:
+        await replicas.check()
+        monitor = asyncio.create_task(
+            replicas.monitor(get_settings().DATABASE_REPLICA_CHECK_INTERVAL)
+        )
+    # Revoked tokens, reloaded in the background (a failed load is retried there)
+    revocations = get_revocations()
+    try:
+        await revocations.load(get_async_sessionmaker())
+    except Exception as e:
+        logger.error(f"Revocation list load failed: {e}")
+    revocation_monitor = asyncio.create_task(
+        revocations.monitor(
+            get_async_sessionmaker(), get_settings().REVOCATION_RELOAD_INTERVAL
+        )
+    )
+    # Report ready only once the pool, statements and serializers are warm,
+    # a worker that cannot warm up stays unready until a retry succeeds
+    # (see /health/ready)
+    warm_up_retry = None
+    try:
+        await warm_up(_app)
+        _app.state.ready = True
+    except Exception as e:
+        logger.error(f"Warm-up failed, the worker is not ready: {e}")
+        warm_up_retry = asyncio.create_task(retry_warm_up(_app))
+    yield
+    _app.state.ready = False
+    if warm_up_retry:
+        warm_up_retry.cancel()
+    if monitor:
+        monitor.cancel()
+    revocation_monitor.cancel()
+    await dispose_engine()
+
+
 # ------------------------------------------
 # FastAPI App Definition
 # ------------------------------------------
@@ -22,13 +85,51 @@ app = FastAPI(
     title="pywjs API",
     description="pywjs API documentation",
     version=get_version(),
+    lifespan=lifespan,
 )
 
 
+# ------------------------------------------
+# Middleware
+# ------------------------------------------
+# The upload body is read before any route dependency runs, its deadline is
+# set by path
+app.add_middleware(DeadlineMiddleware, overrides={"/uploads": UPLOADS_DEADLINE})
+app.add_middleware(QueryBudgetMiddleware)
+
+
+@app.exception_handler(QueryBudgetExceededException)
+async def query_budget_exceeded_handler(
+    _request: Request, exc: QueryBudgetExceededException
+):
+    return JSONResponse(status_code=500, content={"detail": exc.message})
+
+
+# No free connection in the pool within DATABASE_POOL_TIMEOUT, fail fast
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(_request: Request, _exc: PoolTimeoutError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service temporarily unavailable"},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Statement cancelled by the statement_timeout derived from the request deadline
+@app.exception_handler(DBAPIError)
+async def statement_timeout_handler(_request: Request, exc: DBAPIError):
+    if getattr(exc.orig, "sqlstate", None) != "57014":  # query_canceled
+        raise exc
+    return JSONResponse(
+        status_code=504, content={"detail": "Request deadline exceeded"}
+    )
+
+
 # ------------------------------------------
 # Routers
 # ------------------------------------------
 app.include_router(auth_router, prefix="/auth")
+app.include_router(well_known_router)
 app.include_router(users_router, prefix="/users")
 app.include_router(cms_router, prefix="/cms")
 app.include_router(uploads_router, prefix="/uploads")
@@ -38,3 +139,17 @@ app.include_router(uploads_router, prefix="/uploads")
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+# Readiness, 503 until the startup warm-up is done (and while shutting down)
+@app.get("/health/ready")
+async def readiness_check(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
+# Pool and query metrics of this worker
+@app.get("/health/details")
+async def health_details():
+    return {"status": "ok", "metrics": metrics.snapshot()}
@@ -0,0 +1,68 @@
+# scripts/benchmarks/bulk.py
+"""
+Importing posts one `BaseService.create` at a time (one INSERT, commit and
+refresh each) against one `BaseService.bulk_create` call.
+
+Runs on an in-memory SQLite database by default, pass a DATABASE_URL to measure
+against a real server (COPY is used on Postgres above COPY_THRESHOLD rows):
+
+    uv run python scripts/benchmarks/bulk.py [--n 5000] [--url URL]
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.database import SQLModel
+from apps.cms.models.post import Post
+from apps.cms.services.post import PostService
+
+
+def posts(prefix: str, n: int) -> list[dict]:
+    return [
+        {"title": f"Post {i}", "slug": f"{prefix}-{i}", "tags": ["bench"]}
+        for i in range(n)
+    ]
+
+
+async def main(url: str, n: int):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async with session_factory() as session:
+        service = PostService(session=session)
+
+        start = time.perf_counter()
+        for data in posts("one", n):
+            await service.create(Post(**data))
+        one_by_one = time.perf_counter() - start
+        print(f"{'create x ' + str(n):<24} {one_by_one:8.2f} s")
+
+        start = time.perf_counter()
+        await service.bulk_create(posts("bulk", n))
+        bulk = time.perf_counter() - start
+        print(f"{'bulk_create':<24} {bulk:8.2f} s")
+        print(f"speedup: {one_by_one / bulk:.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--n", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.n))
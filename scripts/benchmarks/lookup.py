@@ -0,0 +1,83 @@
+# scripts/benchmarks/lookup.py
+"""
+Per-call overhead of the ORM lookup (`BaseService.get_by_id`) against the
+prebuilt statement fast path (`BaseService.get_row_by_id`).
+
+Runs on an in-memory SQLite database by default so it measures the Python side
+(statement building, compilation cache, hydration), pass a DATABASE_URL to
+measure against a real server:
+
+    uv run python scripts/benchmarks/lookup.py [--n 5000] [--url URL]
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.database import SQLModel
+from apps.users.models import User
+from apps.users.services import UserService
+
+
+async def bench(label: str, fn, n: int) -> float:
+    # Warm up the caches first
+    for _ in range(50):
+        await fn()
+    start = time.perf_counter()
+    for _ in range(n):
+        await fn()
+    per_call = (time.perf_counter() - start) / n * 1e6
+    print(f"{label:<32} {per_call:8.1f} us/call")
+    return per_call
+
+
+async def main(url: str, n: int):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        service = UserService(session=session)
+
+        async def orm():
+            # A fresh identity map per call, like a new request, and no
+            # identity cache hit, so the statement runs every time
+            session.expunge_all()
+            service.identity_cache.clear()
+            await service.get_by_id(user.id)
+
+        async def cached():
+            session.expunge_all()
+            await service.get_by_id(user.id)
+
+        async def row():
+            await service.get_row_by_id(user.id)
+
+        orm_us = await bench("ORM get_by_id", orm, n)
+        row_us = await bench("fast path get_row_by_id", row, n)
+        print(f"speedup: {orm_us / row_us:.2f}x")
+        await bench("identity cache hit get_by_id", cached, n)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--n", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.n))
@@ -0,0 +1,86 @@
+# scripts/benchmarks/signing.py
+"""
+Sign and verify throughput of the access tokens for each supported algorithm
+(the verified-token cache is disabled, every verification checks the signature).
+
+    uv run python scripts/benchmarks/signing.py [--n 5000]
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+import argparse
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from core.security.jwt import JWT, TokenUser
+from core.security.keys import KeySet, SigningKey
+
+
+def bench(fn, n: int) -> float:
+    for _ in range(50):
+        fn()
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+
+def pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def main(n: int):
+    token_user = TokenUser(
+        id="01JVPDJAHW6SCX3T93X85EP4A2",
+        email="bench@example.com",
+        is_verified=True,
+        is_active=True,
+    )
+    secret = "x" * 64
+    jwts = {
+        "HS256": JWT(secret=secret, cache_size=None),
+        "ES256": JWT(
+            secret=secret,
+            cache_size=None,
+            keys=KeySet(
+                (
+                    SigningKey.from_pem(
+                        "es", "ES256", pem(ec.generate_private_key(ec.SECP256R1()))
+                    ),
+                )
+            ),
+        ),
+        "EdDSA": JWT(
+            secret=secret,
+            cache_size=None,
+            keys=KeySet(
+                (
+                    SigningKey.from_pem(
+                        "ed", "EdDSA", pem(ed25519.Ed25519PrivateKey.generate())
+                    ),
+                )
+            ),
+        ),
+    }
+    print(f"{'algorithm':<10} {'sign/s':>10} {'verify/s':>10} {'bytes':>6}")
+    for algorithm, jwt in jwts.items():
+        token = jwt.access_token(token_user)
+        sign = bench(lambda: jwt.access_token(token_user), n)
+        verify = bench(lambda: jwt.decode_typed(token, "access"), n)
+        print(f"{algorithm:<10} {sign:10.0f} {verify:10.0f} {len(token):6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.n)
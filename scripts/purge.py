@@ -0,0 +1,78 @@
+# scripts/purge.py
+"""
+Archive (or delete) the rows soft deleted for longer than the retention period,
+and delete the revocations of the expired tokens.
+
+    uv run python scripts/purge.py [--retention-days 30] [--mode archive|delete]
+        [--batch-size 500] [--pause 0.1] [--tables user,page]
+
+Runs in small transactions with a pause between them, it can run next to the
+live traffic (e.g. from a nightly cron job).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import argparse
+import asyncio
+from datetime import timedelta
+
+from core.config import get_settings
+from core.database import dispose_engine, get_async_engine
+from core.purge import PurgeMode, PurgeStats, purge
+from apps.auth.revocation import purge_expired
+
+
+def report(stats: PurgeStats) -> None:
+    print(
+        f"  {stats.table:<16} {stats.rows:>8} rows  {stats.batches:>5} batches"
+        f"  {stats.rate:>8.0f} rows/s",
+        end="\r",
+    )
+
+
+async def main(args: argparse.Namespace):
+    retention = timedelta(days=args.retention_days)
+    print(
+        f"Purging rows deleted more than {args.retention_days} days ago ({args.mode})"
+    )
+    try:
+        results = await purge(
+            get_async_engine(),
+            retention,
+            mode=PurgeMode(args.mode),
+            batch_size=args.batch_size,
+            pause=args.pause,
+            tables=args.tables.split(",") if args.tables else None,
+            report=report,
+        )
+        revocations = await purge_expired(get_async_engine())
+    finally:
+        await dispose_engine()
+    print()
+    for stats in results:
+        print(
+            f"✅ {stats.table:<16} {stats.rows:>8} rows in {stats.elapsed:.1f}s"
+            f" ({stats.rate:.0f} rows/s)"
+        )
+    print(f"✅ {'revoked_token':<16} {revocations:>8} expired revocations")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--retention-days", type=int, default=get_settings().SOFT_DELETE_RETENTION_DAYS
+    )
+    parser.add_argument(
+        "--mode", choices=[m.value for m in PurgeMode], default="archive"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--pause", type=float, default=0.1, help="seconds between batches"
+    )
+    parser.add_argument(
+        "--tables", help="comma separated, all soft delete tables by default"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -1,7 +1,7 @@
 # tests/auth/test_deps.py
 
 import pytest
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from httpx import AsyncClient
 
 from apps.auth.deps import active_user_token, staff_user_token, admin_user_token
@@ -25,6 +25,11 @@ def app() -> FastAPI:
     async def admin_route(token_user: User = Depends(admin_user_token)):
         return {"message": "Admin route", "user": token_user.email}
 
+    @app.get("/state", dependencies=[Depends(active_user_token)])
+    async def state_route(request: Request):
+        claims = request.state.claims
+        return {"sub": claims.sub, "is_staff": claims.is_staff}
+
     return app
 
 
@@ -109,3 +114,37 @@ class TestDeps:
         )
         assert response.status_code == 403
         assert "Permission denied" in response.json()["detail"]
+
+    # Test active user token failure with a refresh token
+    @pytest.mark.anyio
+    async def test_active_user_token_failure_refresh_token(
+        self, client: AsyncClient, create_test_user, get_token_pair_for_user
+    ):
+        token_pair = await get_token_pair_for_user(create_test_user)
+        response = await client.get(
+            "/protected",
+            headers={"Authorization": f"Bearer {token_pair.refresh_token}"},
+        )
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid token"}
+
+    # Test active user token failure with a malformed token
+    @pytest.mark.anyio
+    async def test_active_user_token_failure_invalid(self, client: AsyncClient):
+        response = await client.get(
+            "/protected", headers={"Authorization": "Bearer invalid_token"}
+        )
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid token"}
+
+    # Test the claims are shared through request.state
+    @pytest.mark.anyio
+    async def test_claims_in_request_state(
+        self, client: AsyncClient, create_staff_user, get_token_pair_for_user
+    ):
+        token_pair = await get_token_pair_for_user(create_staff_user)
+        response = await client.get(
+            "/state", headers={"Authorization": f"Bearer {token_pair.access_token}"}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"sub": create_staff_user.id, "is_staff": True}
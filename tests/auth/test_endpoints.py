@@ -3,6 +3,10 @@
 import pytest
 from httpx import AsyncClient
 
+from apps.auth.exceptions import UserIsDeletedException
+from apps.auth.services import AuthService
+from tests.conftest import TestingSessionLocal, save_user_to_db
+
 
 # ---------------------------------------------
 # Test auth/token endpoint
@@ -117,13 +121,28 @@ class TestLogin:
         assert response.status_code == 403
         assert response.json()["detail"] == "Account is not active"
 
-    # Test login with deleted user
+    # Test login with deleted user, told apart by the service but not the client
     @pytest.mark.anyio
     async def test_login_deleted_user(self, client: AsyncClient, create_deleted_user):
         data = {
             "email": create_deleted_user.email,
             "password": "test123",
         }
+        async with TestingSessionLocal() as session:
+            with pytest.raises(UserIsDeletedException):
+                await AuthService(session).authenticate(**data)
+        response = await client.post("/auth/login", json=data)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid credentials"
+
+    # A deleted user that is also inactive is not told the account exists
+    @pytest.mark.anyio
+    async def test_login_deleted_inactive_user(
+        self, client: AsyncClient, create_deleted_user
+    ):
+        create_deleted_user.is_active = False
+        await save_user_to_db(create_deleted_user)
+        data = {"email": "deleted@example.com", "password": "test123"}
         response = await client.post("/auth/login", json=data)
         assert response.status_code == 401
         assert response.json()["detail"] == "Invalid credentials"
@@ -203,3 +222,43 @@ class TestVerification:
         response = await client.get("/auth/verify", params={"token": "invalid_token"})
         assert response.status_code == 401
         assert response.json()["detail"] == "Invalid verification token"
+
+
+# ---------------------------------------------
+# Test /.well-known/jwks.json endpoint
+# ---------------------------------------------
+class TestJWKS:
+    @pytest.mark.anyio
+    async def test_jwks(self, client: AsyncClient, monkeypatch):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+        from core.security.jwt import JWT
+        from core.security.keys import KeySet, SigningKey
+
+        pem = ed25519.Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        key = SigningKey.from_pem("k1", "EdDSA", private_key=pem)
+        jwt = JWT(secret="secret", keys=KeySet((key,)))
+        monkeypatch.setattr("apps.auth.endpoints.get_jwt", lambda: jwt)
+
+        response = await client.get("/.well-known/jwks.json")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=300"
+        (jwk,) = response.json()["keys"]
+        assert jwk["kid"] == "k1" and jwk["alg"] == "EdDSA" and "d" not in jwk
+        # Revalidation
+        etag = response.headers["etag"]
+        response = await client.get(
+            "/.well-known/jwks.json", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    @pytest.mark.anyio
+    async def test_jwks_without_keys(self, client: AsyncClient):
+        # The secret is never published
+        response = await client.get("/.well-known/jwks.json")
+        assert response.status_code == 200
+        assert response.json() == {"keys": []}
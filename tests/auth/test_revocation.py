@@ -0,0 +1,96 @@
+# tests/auth/test_revocation.py
+
+from datetime import timedelta
+
+import pytest
+from httpx import AsyncClient
+
+from apps.auth.models import RevokedToken
+from apps.auth.revocation import RevocationList, purge_expired
+from tests.conftest import TestingSessionLocal, engine, save_to_db
+from utils.time import current_time
+
+
+def _revoked(jti: str, expires_in: timedelta = timedelta(hours=1)) -> RevokedToken:
+    return RevokedToken(jti=jti, sub="user", expires_at=current_time() + expires_in)
+
+
+class TestRevocationList:
+    @pytest.mark.anyio
+    async def test_load(self, setup_database):
+        await save_to_db(_revoked("revoked"))
+        await save_to_db(_revoked("expired", timedelta(hours=-1)))
+        revocations = RevocationList(capacity=100)
+        await revocations.load(TestingSessionLocal)
+        assert revocations.might_be_revoked("revoked")
+        assert not revocations.might_be_revoked("expired")
+        assert not revocations.might_be_revoked("valid")
+        assert not revocations.might_be_revoked(None)
+        async with TestingSessionLocal() as session:
+            assert await revocations.is_revoked("revoked", session)
+        # Settled, kept in the exact set
+        assert "revoked" in revocations.recent
+
+    @pytest.mark.anyio
+    async def test_reload(self, setup_database):
+        revocations = RevocationList(capacity=100)
+        await revocations.load(TestingSessionLocal)
+        # Revoked by an other worker
+        await save_to_db(_revoked("revoked"))
+        assert not revocations.might_be_revoked("revoked")
+        await revocations.reload(TestingSessionLocal)
+        assert revocations.might_be_revoked("revoked")
+
+    @pytest.mark.anyio
+    async def test_false_positive_is_cleared(self, setup_database):
+        revocations = RevocationList(capacity=100)
+        # A Bloom filter hit that is not in the table
+        revocations.bloom.add("valid")
+        async with TestingSessionLocal() as session:
+            assert not await revocations.is_revoked("valid", session)
+        assert revocations.lookups.value >= 1
+        # Not queried again
+        assert not revocations.might_be_revoked("valid")
+
+    @pytest.mark.anyio
+    async def test_purge_expired(self, setup_database):
+        await save_to_db(_revoked("revoked"))
+        await save_to_db(_revoked("expired", timedelta(hours=-1)))
+        assert await purge_expired(engine) == 1
+
+
+class TestRevokeEndpoint:
+    @pytest.mark.anyio
+    async def test_revoke_access_token(
+        self, client: AsyncClient, create_test_user, get_token_pair_for_user
+    ):
+        token_pair = await get_token_pair_for_user(create_test_user)
+        headers = {"Authorization": f"Bearer {token_pair.access_token}"}
+        assert (await client.get("/users/me", headers=headers)).status_code == 200
+        response = await client.post(
+            "/auth/revoke", data={"token": token_pair.access_token}
+        )
+        assert response.status_code == 200
+        response = await client.get("/users/me", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+
+    @pytest.mark.anyio
+    async def test_revoke_refresh_token(
+        self, client: AsyncClient, create_test_user, get_token_pair_for_user
+    ):
+        token_pair = await get_token_pair_for_user(create_test_user)
+        await client.post("/auth/revoke", data={"token": token_pair.refresh_token})
+        response = await client.post(
+            "/auth/refresh",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": token_pair.refresh_token,
+            },
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.anyio
+    async def test_revoke_invalid_token(self, client: AsyncClient, setup_database):
+        response = await client.post("/auth/revoke", data={"token": "invalid_token"})
+        assert response.status_code == 200
@@ -0,0 +1,80 @@
+# tests/cms/test_navigation.py
+
+import pytest
+from httpx import AsyncClient
+
+from apps.cms.models.navigation import Navigation, NavigationItem
+from apps.cms.models.page import Page
+from core import config
+from tests.conftest import save_to_db
+
+
+class TestNavigation:
+    # Test create navigation (unit of work, committed at the end of the request)
+    @pytest.mark.anyio
+    async def test_create_navigation(self, client: AsyncClient, setup_database):
+        response = await client.post(
+            "/cms/navigations/", json={"title": "Main", "slug": "main"}
+        )
+        assert response.status_code == 201
+        assert response.json()["items"] == []
+
+        navigation_id = response.json()["id"]
+        response = await client.get(f"/cms/navigations/{navigation_id}")
+        assert response.status_code == 200
+        assert response.json()["slug"] == "main"
+
+    # Test create navigation with a duplicate slug
+    @pytest.mark.anyio
+    async def test_create_navigation_duplicate(
+        self, client: AsyncClient, setup_database
+    ):
+        data = {"title": "Main", "slug": "main"}
+        await client.post("/cms/navigations/", json=data)
+        response = await client.post("/cms/navigations/", json=data)
+        assert response.status_code == 400
+
+    # Test create navigation item
+    @pytest.mark.anyio
+    async def test_create_navigation_item(self, client: AsyncClient, setup_database):
+        response = await client.post(
+            "/cms/navigations/", json={"title": "Main", "slug": "main"}
+        )
+        navigation_id = response.json()["id"]
+        response = await client.post(
+            f"/cms/navigations/{navigation_id}/items",
+            json={"title": "Home", "slug": "home"},
+        )
+        assert response.status_code == 201
+        assert response.json()["children"] == []
+
+    # The linked pages are resolved with one query, whatever the number of items
+    @pytest.mark.anyio
+    async def test_list_items_resolves_pages(
+        self, client: AsyncClient, setup_database, monkeypatch
+    ):
+        monkeypatch.setattr(config.get_settings(), "DEBUG", True)
+        navigation = Navigation(title="Main", slug="main")
+        await save_to_db(navigation)
+        for i in range(3):
+            page = Page(title=f"Page {i}", slug=f"page-{i}")
+            await save_to_db(page)
+            await save_to_db(
+                NavigationItem(
+                    title=f"Item {i}",
+                    slug=f"item-{i}",
+                    order=i,
+                    page_id=page.id,
+                    navigation_id=navigation.id,
+                )
+            )
+        response = await client.get(f"/cms/navigations/{navigation.id}/items")
+        assert response.status_code == 200
+        items = sorted(response.json(), key=lambda item: item["order"])
+        assert [item["page"]["slug"] for item in items] == [
+            "page-0",
+            "page-1",
+            "page-2",
+        ]
+        # items, their children and the pages
+        assert response.headers["X-DB-Queries"] == "3"
@@ -0,0 +1,78 @@
+# tests/cms/test_pages.py
+
+import pytest
+from httpx import AsyncClient
+
+from apps.cms.models.page import Page
+from tests.conftest import save_to_db
+
+
+@pytest.fixture
+async def pages(setup_database) -> list[dict]:
+    pages = []
+    for i in range(3):
+        page = Page(title=f"Page {i}", slug=f"page-{i}", body_html="<p>Body</p>")
+        await save_to_db(page)
+        pages.append({"id": page.id, "title": page.title})
+    return sorted(pages, key=lambda p: p["id"])
+
+
+class TestPages:
+    # Test the page slug lookup
+    @pytest.mark.anyio
+    async def test_get_page_by_slug(self, client: AsyncClient, pages):
+        response = await client.get("/cms/pages/slug/page-1")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Page 1"
+
+        response = await client.get("/cms/pages/slug/missing")
+        assert response.status_code == 404
+
+    # Test cursor pagination with Link headers
+    @pytest.mark.anyio
+    async def test_list_pages_cursor(self, client: AsyncClient, pages):
+        response = await client.get("/cms/pages/", params={"cursor": "", "limit": 2})
+        assert response.status_code == 200
+        assert [p["id"] for p in response.json()] == [p["id"] for p in pages[:2]]
+        assert 'rel="next"' in response.headers["Link"]
+
+        next_url = response.links["next"]["url"]
+        response = await client.get(next_url)
+        assert [p["id"] for p in response.json()] == [pages[2]["id"]]
+        assert "next" not in response.links
+        assert "prev" in response.links
+
+    # Test the summary view of the list and ?fields=
+    @pytest.mark.anyio
+    async def test_list_pages_fields(self, client: AsyncClient, pages):
+        response = await client.get("/cms/pages/")
+        assert response.status_code == 200
+        page = response.json()[0]
+        assert page["title"] == "Page 0" and "body_html" not in page
+
+        response = await client.get(
+            "/cms/pages/", params={"fields": "body_html,meta_title"}
+        )
+        page = response.json()[0]
+        assert page["body_html"] == "<p>Body</p>" and page["meta_title"] is None
+
+        response = await client.get("/cms/pages/", params={"fields": "*"})
+        assert response.json()[0]["og_type"] == "website"
+
+        response = await client.get("/cms/pages/", params={"fields": "is_deleted"})
+        assert response.status_code == 400
+
+    # Test the X-Total-Count header
+    @pytest.mark.anyio
+    async def test_list_pages_total(self, client: AsyncClient, pages):
+        response = await client.get(
+            "/cms/pages/", params={"cursor": "", "limit": 2, "total": "cached"}
+        )
+        assert response.headers["X-Total-Count"] == "3"
+        assert response.headers["X-Total-Count-Mode"] == "cached"
+
+    # Test an invalid cursor
+    @pytest.mark.anyio
+    async def test_list_pages_invalid_cursor(self, client: AsyncClient, pages):
+        response = await client.get("/cms/pages/", params={"cursor": "nope"})
+        assert response.status_code == 400
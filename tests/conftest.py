@@ -9,7 +9,9 @@ from typing import AsyncGenerator
 from core.security import get_pwd_hasher, get_jwt
 from core.security.jwt import TokenUser, TokenPair, VerificationToken
 from main import app as main_app
-from core.database import get_session
+from core.database import defer_release, get_async_sessionmaker, get_session
+from core.services import _count_cache, _identity_caches
+from apps.auth.revocation import get_revocations
 from sqlmodel import SQLModel
 import asyncio
 from unittest.mock import AsyncMock
@@ -57,11 +59,13 @@ def patch_settings(monkeypatch):
 # ----------------------------------
 async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
     async with TestingSessionLocal() as session:
-        yield session
+        yield defer_release(session)
 
 
 # noinspection PyUnresolvedReferences
 main_app.dependency_overrides[get_session] = override_get_session
+# Streaming responses open their own sessions
+main_app.dependency_overrides[get_async_sessionmaker] = lambda: TestingSessionLocal
 
 
 # ----------------------------------
@@ -84,6 +88,10 @@ async def setup_database():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.drop_all)
         await conn.run_sync(SQLModel.metadata.create_all)
+    # Cached results would outlive the recreated tables
+    _count_cache.clear()
+    _identity_caches.clear()
+    get_revocations().clear()
 
 
 # ----------------------------------
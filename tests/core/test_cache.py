@@ -0,0 +1,47 @@
+# tests/core/test_cache.py
+import time
+
+from core.cache import BloomFilter, LRUCache
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now the least recently used
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl(self):
+        cache = LRUCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2, expires_at=time.monotonic() - 1)
+        assert cache.get("a") == 1
+        assert cache.get("b", "missing") == "missing"
+
+    def test_stats(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key{i}")
+        assert all(f"key{i}" in bloom for i in range(1000))
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key{i}")
+        false_positives = sum(f"other{i}" in bloom for i in range(10_000))
+        assert false_positives < 10_000 * 0.02
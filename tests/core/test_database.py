@@ -0,0 +1,178 @@
+# tests/core/test_database.py
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from httpx import AsyncClient
+from pydantic import BaseModel, model_validator
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import select
+
+from apps.users.models import User
+from core import config
+from core.database import (
+    USE_PRIMARY,
+    RoutingSession,
+    SessionRoute,
+    dispose_engine,
+    engine_kwargs,
+    get_async_engine,
+    get_async_sessionmaker,
+    get_session,
+    init_engine,
+)
+
+
+@pytest.fixture
+async def fresh_engine():
+    await dispose_engine()
+    yield
+    await dispose_engine()
+
+
+@pytest.mark.anyio
+async def test_engine_is_shared(fresh_engine):
+    engine = init_engine()
+    # Same engine (and pool) for every caller in the process
+    assert get_async_engine() is engine
+    assert get_async_sessionmaker().kw["bind"] is engine
+    assert get_async_sessionmaker() is get_async_sessionmaker()
+
+
+@pytest.mark.anyio
+async def test_dispose_engine(fresh_engine):
+    engine = init_engine()
+    await dispose_engine()
+    # A new engine is built after disposal
+    assert get_async_engine() is not engine
+
+
+@pytest.fixture
+async def replicas(monkeypatch):
+    from core.database import ReplicaSet
+
+    primary = create_async_engine("sqlite+aiosqlite://")
+    replica = create_async_engine("sqlite+aiosqlite://")
+    replica_set = ReplicaSet([replica], max_lag=5)
+    monkeypatch.setattr("core.database._replicas", replica_set)
+    yield primary, replica, replica_set
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.anyio
+async def test_reads_go_to_replica(replicas):
+    primary, replica, _ = replicas
+    session = RoutingSession(bind=primary.sync_engine)
+    assert session.get_bind(clause=select(User)) is replica.sync_engine
+    # Writes and locking reads go to the primary
+    assert session.get_bind(clause=insert(User)) is primary.sync_engine
+    assert session.get_bind(clause=select(User).with_for_update()) is (
+        primary.sync_engine
+    )
+
+
+@pytest.mark.anyio
+async def test_transaction_sticks_to_one_replica(replicas, monkeypatch):
+    from core.database import ReplicaSet
+
+    primary, replica, _ = replicas
+    other = create_async_engine("sqlite+aiosqlite://")
+    monkeypatch.setattr("core.database._replicas", ReplicaSet([replica, other], 5))
+    session = RoutingSession(bind=primary.sync_engine)
+    session.begin()
+    assert session.get_bind(clause=select(User)) is replica.sync_engine
+    assert session.get_bind(clause=select(User)) is replica.sync_engine
+    session.rollback()
+    # The next transaction picks the next replica
+    assert session.get_bind(clause=select(User)) is other.sync_engine
+    await other.dispose()
+
+
+@pytest.mark.anyio
+async def test_reads_stick_to_primary_after_write(replicas):
+    primary, _, _ = replicas
+    session = RoutingSession(bind=primary.sync_engine)
+    session.info[USE_PRIMARY] = True
+    assert session.get_bind(clause=select(User)) is primary.sync_engine
+
+
+@pytest.mark.anyio
+async def test_unhealthy_replica_falls_back_to_primary(replicas):
+    primary, replica, replica_set = replicas
+    replica_set.mark(replica, False)
+    session = RoutingSession(bind=primary.sync_engine)
+    assert session.get_bind(clause=select(User)) is primary.sync_engine
+
+
+@pytest.mark.anyio
+async def test_replica_health_check(replicas):
+    _, replica, replica_set = replicas
+    replica_set.mark(replica, False)
+    await replica_set.check()
+    assert replica_set.healthy[replica] is True
+
+
+def test_engine_kwargs_direct_mode():
+    kwargs = engine_kwargs(config.get_settings(), "postgresql+asyncpg://u:p@db/app")
+    assert kwargs["pool_size"] == config.get_settings().DATABASE_POOL_SIZE
+    assert "connect_args" not in kwargs
+
+
+def test_engine_kwargs_pgbouncer_mode(monkeypatch):
+    settings = config.get_settings()
+    monkeypatch.setattr(settings, "DATABASE_POOL_MODE", "pgbouncer")
+    kwargs = engine_kwargs(settings, "postgresql+asyncpg://u:p@pgbouncer/app")
+    assert kwargs["poolclass"] is NullPool
+    assert kwargs["connect_args"]["statement_cache_size"] == 0
+    assert kwargs["connect_args"]["prepared_statement_cache_size"] == 0
+    # Prepared statement names are unique
+    name = kwargs["connect_args"]["prepared_statement_name_func"]
+    assert name() != name()
+    # The engine can be built with those arguments
+    engine = create_async_engine("postgresql+asyncpg://u:p@pgbouncer/app", **kwargs)
+    assert isinstance(engine.pool, NullPool)
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    """An app whose endpoint records whether its session is still in a transaction
+    while the response is serialized."""
+    from apps.users.services import UserService
+    from main import app as main_app
+
+    app = FastAPI()
+    app.dependency_overrides = main_app.dependency_overrides
+    router = APIRouter(route_class=SessionRoute)
+    sessions = []
+
+    class Serialized(BaseModel):
+        in_transaction: bool
+
+        @model_validator(mode="before")
+        @classmethod
+        def record(cls, _data):
+            return {"in_transaction": sessions[0].in_transaction()}
+
+    @router.get("/reads", response_model=Serialized)
+    async def reads(session=Depends(get_session)):
+        sessions.append(session)
+        service = UserService(session=session)
+        await service.get_all()
+        await service.count()
+        # Consecutive reads share the transaction of the request
+        assert session.in_transaction()
+        return {}
+
+    app.include_router(router)
+    return app
+
+
+# The connection is given back when the endpoint returns, before serialization
+@pytest.mark.anyio
+async def test_session_route_releases_before_serialization(
+    client: AsyncClient, setup_database
+):
+    response = await client.get("/reads")
+    assert response.status_code == 200
+    assert response.json() == {"in_transaction": False}
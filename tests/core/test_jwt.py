@@ -2,7 +2,11 @@
 import pytest
 from core.security.jwt import JWT, TokenUser, TokenPair, JWTTokenPayload
 from utils.time import current_time
-from core.security.exceptions import ExpiredTokenException
+from core.security.exceptions import (
+    ExpiredTokenException,
+    InvalidTokenException,
+    InvalidTokenTypeException,
+)
 
 
 @pytest.fixture
@@ -72,7 +76,7 @@ def test_refresh_token_is_minimal(jwt, token_user):
     assert payload.get("token_type") == "refresh"
 
     # Ensure only minimal fields are present
-    allowed_keys = ["sub", "iat", "exp", "token_type", "id"]
+    allowed_keys = ["sub", "iat", "exp", "jti", "token_type", "id"]
     assert all(key in allowed_keys for key in payload.keys())
 
 
@@ -83,6 +87,21 @@ def test_invalid_token_type_rejected(jwt, token_user):
     assert jwt.verify(access_token, token_type="refresh") is False
 
 
+def test_decode_typed(jwt, token_user):
+    token_pair = jwt.token_pair(token_user)
+    token_data = jwt.decode_typed(token_pair.access_token, "access")
+    assert token_data.id == token_user.id
+    assert token_data.token_type == "access"
+    assert token_data.jti is not None
+    assert jwt.decode_typed(token_pair.refresh_token, "refresh").id == token_user.id
+    with pytest.raises(InvalidTokenTypeException):
+        jwt.decode_typed(token_pair.access_token, "refresh")
+    with pytest.raises(InvalidTokenTypeException):
+        jwt.decode_typed(token_pair.refresh_token, "access")
+    with pytest.raises(InvalidTokenException):
+        jwt.decode_typed("invalid_token", "access")
+
+
 def test_expired_token_is_invalid(jwt, token_user):
     from datetime import timedelta
 
@@ -96,6 +115,8 @@ def test_expired_token_is_invalid(jwt, token_user):
     token = jwt._encode_jwt(JWTTokenPayload.model_construct(**payload))
     with pytest.raises(ExpiredTokenException):
         jwt.verify(token, token_type="access")
+    with pytest.raises(ExpiredTokenException):
+        jwt.decode_typed(token, "access")
 
 
 def test_staff_is_not_admin(jwt, staff_token_user):
@@ -113,3 +134,194 @@ def test_staff_is_not_admin(jwt, staff_token_user):
     assert token_data.is_verified == staff_token_user.is_verified
     # Test that staff is not admin
     assert token_data.is_admin is False
+
+
+def test_claims_are_cached(jwt, token_user):
+    token = jwt.access_token(token_user)
+    first = jwt.claims(token)
+    # The second call is served from the cache, no verification
+    assert jwt.claims(token) is first
+    assert jwt.cache.stats()["hits"] == 1
+    # An other token is an other entry
+    other = jwt.refresh_token(token_user)
+    assert jwt.claims(other) is not first
+    assert len(jwt.cache) == 2
+
+
+def test_cached_token_expires(jwt, token_user, monkeypatch):
+    import time
+
+    token = jwt.access_token(token_user)
+    first = jwt.claims(token)
+    # The entry is dropped when the token expires, the token is verified again
+    expires = time.monotonic() + jwt.access_token_expire_minutes * 60 + 1
+    monkeypatch.setattr(time, "monotonic", lambda: expires)
+    assert jwt.claims(token) is not first
+    assert jwt.cache.stats()["hits"] == 0
+
+
+def test_token_cache_disabled(token_user):
+    jwt = JWT(secret="secret", cache_size=None)
+    token = jwt.access_token(token_user)
+    assert jwt.cache is None
+    assert jwt.claims(token) == jwt.claims(token)
+
+
+def _pem_key(algorithm: str) -> bytes:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+    if algorithm == "EdDSA":
+        key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+@pytest.mark.parametrize("algorithm", ["EdDSA", "ES256"])
+def test_asymmetric_keys(token_user, algorithm):
+    import jwt as _jwt
+    from core.security.keys import KeySet, SigningKey
+
+    key = SigningKey.from_pem("k1", algorithm, private_key=_pem_key(algorithm))
+    jwt = JWT(secret="secret", keys=KeySet((key,)))
+    token = jwt.access_token(token_user)
+    assert _jwt.get_unverified_header(token) == {
+        "alg": algorithm,
+        "kid": "k1",
+        "typ": "JWT",
+    }
+    assert jwt.decode_typed(token, "access").id == token_user.id
+    # Verified with the published key only, like an other service would do
+    (jwk,) = jwt.jwks()["keys"]
+    assert jwk["kid"] == "k1" and "d" not in jwk
+    payload = _jwt.decode(
+        token, _jwt.PyJWK(jwk).key, algorithms=[algorithm], options={"verify_exp": True}
+    )
+    assert payload["sub"] == token_user.id
+
+
+def test_key_rotation(token_user):
+    from datetime import timedelta
+    from core.security.keys import KeySet, SigningKey
+
+    now = current_time()
+    old = SigningKey.from_pem(
+        "old", "EdDSA", private_key=_pem_key("EdDSA"), not_after=now + timedelta(days=1)
+    )
+    new = SigningKey.from_pem(
+        "new",
+        "EdDSA",
+        private_key=_pem_key("EdDSA"),
+        not_before=now - timedelta(hours=1),
+    )
+    upcoming = SigningKey.from_pem(
+        "upcoming",
+        "EdDSA",
+        private_key=_pem_key("EdDSA"),
+        not_before=now + timedelta(hours=1),
+    )
+    keys = KeySet((old, new, upcoming))
+    # The newest active key signs, the upcoming key is already published
+    assert keys.signing_key(now).kid == "new"
+    assert [k["kid"] for k in keys.jwks(now)["keys"]] == ["old", "new", "upcoming"]
+    # Tokens signed with the old key are trusted until its window ends
+    old_token = JWT(secret="secret", keys=KeySet((old,))).access_token(token_user)
+    jwt = JWT(secret="secret", keys=keys, cache_size=None)
+    assert jwt.decode_typed(old_token, "access").id == token_user.id
+    later = now + timedelta(days=2)
+    assert keys.verification_key("old", later) is None
+    assert [k["kid"] for k in keys.jwks(later)["keys"]] == ["new", "upcoming"]
+    # Unknown kid
+    rogue = JWT(
+        secret="secret",
+        keys=KeySet((SigningKey.from_pem("rogue", "EdDSA", _pem_key("EdDSA")),)),
+    )
+    with pytest.raises(InvalidTokenException):
+        jwt.decode_typed(rogue.access_token(token_user), "access")
+
+
+def test_secret_tokens_accepted_with_keys(jwt, token_user):
+    from datetime import timedelta
+    from core.security.keys import KeySet, SigningKey
+
+    # Tokens issued with the secret before the switch to the keys
+    token = jwt.access_token(token_user)
+    key = SigningKey.from_pem("k1", "EdDSA", private_key=_pem_key("EdDSA"))
+    with_keys = JWT(
+        secret="secret",
+        keys=KeySet((key,)),
+        legacy_until=current_time() + timedelta(days=1),
+    )
+    assert with_keys.decode_typed(token, "access").id == token_user.id
+
+
+def test_secret_tokens_rejected_after_cutoff(jwt, token_user, monkeypatch):
+    import time
+    from datetime import timedelta
+    from core.security.keys import KeySet, SigningKey
+
+    token = jwt.access_token(token_user)
+    keys = KeySet((SigningKey.from_pem("k1", "EdDSA", _pem_key("EdDSA")),))
+    # Without a cutoff, they are rejected as soon as the keys are set
+    with pytest.raises(InvalidTokenException):
+        JWT(secret="secret", keys=keys).decode_typed(token, "access")
+    cutoff = current_time() + timedelta(seconds=60)
+    with_keys = JWT(secret="secret", keys=keys, legacy_until=cutoff)
+    assert with_keys.decode_typed(token, "access").id == token_user.id
+    # Past the cutoff, the cached claims are dropped and the token is rejected
+    later = time.monotonic() + 61
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    with_keys.legacy_until = current_time()
+    with pytest.raises(InvalidTokenException):
+        with_keys.decode_typed(token, "access")
+
+
+def test_claims(jwt, staff_token_user):
+    from core.security.claims import Claims, ACTIVE, STAFF, VERIFIED
+
+    claims = jwt.claims(jwt.access_token(staff_token_user))
+    assert isinstance(claims, Claims)
+    assert claims.flags == ACTIVE | VERIFIED | STAFF
+    assert (claims.is_active, claims.is_staff, claims.is_admin) == (True, True, False)
+    assert claims.email == staff_token_user.email
+    # Shared between the requests, immutable and without __dict__
+    with pytest.raises(AttributeError):
+        claims.flags = 0
+    assert not hasattr(claims, "__dict__")
+
+
+@pytest.mark.parametrize("claim", ["sub", "exp"])
+def test_missing_claim_is_invalid(jwt, claim):
+    import jwt as _jwt
+
+    payload = {"sub": "01JVPDJAHW6SCX3T93X85EP4A2", "token_type": "access"}
+    payload["exp"] = int(current_time().timestamp()) + 60
+    del payload[claim]
+    token = _jwt.encode(payload, "secret", algorithm="HS256")
+    with pytest.raises(InvalidTokenException):
+        jwt.decode_typed(token, "access")
+
+
+def test_key_times_require_a_timezone():
+    from pydantic import ValidationError
+    from core.config import JWTKeySettings, Settings
+
+    required = dict(
+        DATABASE_URL="sqlite://",
+        SECRET_KEY="x",
+        ADMIN_EMAIL="a@example.com",
+        ADMIN_PASSWORD="x",
+        SMTP_HOST="x",
+    )
+    # Naive times would fail the comparisons with the current UTC time later
+    with pytest.raises(ValidationError):
+        JWTKeySettings(kid="k1", not_before="2026-12-01T00:00:00")
+    with pytest.raises(ValidationError):
+        Settings(**required, JWT_LEGACY_HS_UNTIL="2026-12-01T00:00:00")
+    key = JWTKeySettings(kid="k1", not_after="2026-12-01T00:00:00Z")
+    assert key.not_after.tzinfo is not None
@@ -0,0 +1,31 @@
+# tests/core/test_metrics.py
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import instrument_engine
+from core.metrics import Histogram, metrics
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["max"] == 50
+    # Buckets are cumulative
+    assert snapshot["buckets"] == {"1": 2, "10": 3, "+Inf": 4}
+
+
+@pytest.mark.anyio
+async def test_instrumented_engine_records_statements():
+    engine = instrument_engine(create_async_engine("sqlite+aiosqlite://"))
+    statements = metrics.counter("db.statements").value
+    rows = metrics.histogram("db.statement.rows").count
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1 UNION ALL SELECT 2"))
+    await engine.dispose()
+    assert metrics.counter("db.statements").value == statements + 1
+    assert metrics.histogram("db.statement.rows").count == rows + 1
+    assert metrics.counter("db.pool.checkouts").value >= 1
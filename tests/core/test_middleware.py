@@ -0,0 +1,156 @@
+# tests/core/test_middleware.py
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI, Depends
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from core import config
+from core.database import QueryBudgetExceededException, get_session
+from core.middleware import (
+    DeadlineMiddleware,
+    QueryBudgetMiddleware,
+    request_deadline,
+)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = config.get_settings()
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "DB_QUERY_BUDGET", 5)
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+    return settings
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    """Override the default app fixture with a route running `n` statements."""
+    from main import app as main_app
+
+    app = FastAPI()
+    app.add_middleware(DeadlineMiddleware)
+    app.add_middleware(QueryBudgetMiddleware)
+    app.dependency_overrides = main_app.dependency_overrides
+
+    @app.get("/queries/{n}")
+    async def queries(n: int, session=Depends(get_session)):
+        for i in range(n):
+            await session.exec(text("SELECT :i"), params={"i": i})
+        return {"n": n}
+
+    @app.get("/sleep/{seconds}")
+    async def sleep(seconds: float):
+        await asyncio.sleep(seconds)
+        return {"slept": seconds}
+
+    fast = APIRouter(dependencies=[Depends(request_deadline(0.05))])
+
+    @fast.get("/fast/sleep/{seconds}")
+    async def fast_sleep(seconds: float):
+        await asyncio.sleep(seconds)
+        return {"slept": seconds}
+
+    app.include_router(fast)
+    return app
+
+
+class TestQueryBudget:
+    @pytest.mark.anyio
+    async def test_debug_headers(self, client: AsyncClient, settings):
+        response = await client.get("/queries/2")
+        assert response.status_code == 200
+        assert response.headers["X-DB-Queries"] == "2"
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+
+    @pytest.mark.anyio
+    async def test_n_plus_one_logged(self, client: AsyncClient, settings, caplog):
+        response = await client.get("/queries/4")
+        assert response.status_code == 200
+        assert "possible N+1" in caplog.text
+
+    @pytest.mark.anyio
+    async def test_budget_raise_mode(self, client: AsyncClient, settings, monkeypatch):
+        monkeypatch.setattr(settings, "DB_QUERY_BUDGET_MODE", "raise")
+        monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", None)
+        with pytest.raises(QueryBudgetExceededException):
+            await client.get("/queries/6")
+
+
+class TestDeadline:
+    @pytest.mark.anyio
+    async def test_within_deadline(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 1)
+        response = await client.get("/sleep/0")
+        assert response.status_code == 200
+
+    @pytest.mark.anyio
+    async def test_deadline_exceeded(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 0.05)
+        response = await client.get("/sleep/5")
+        assert response.status_code == 504
+
+    # The router dependency overrides the default deadline
+    @pytest.mark.anyio
+    async def test_router_deadline(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 5)
+        response = await client.get("/fast/sleep/1")
+        assert response.status_code == 504
+
+    # The request is cancelled when the client goes away
+    @pytest.mark.anyio
+    async def test_client_disconnect_cancels_request(self, monkeypatch):
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 5)
+        cancelled = asyncio.Event()
+        sent = []
+
+        async def slow_app(scope, receive, send):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/"}
+        await asyncio.wait_for(DeadlineMiddleware(slow_app)(scope, receive, send), 1)
+        assert cancelled.is_set()
+        assert sent == []
+
+    # The body is read as the app reads it, not buffered ahead by the watcher
+    @pytest.mark.anyio
+    async def test_body_not_buffered(self, monkeypatch):
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 5)
+        received = 0
+        read_ahead = []
+
+        async def receive():
+            nonlocal received
+            received += 1
+            if received > 100:
+                await asyncio.Event().wait()  # no disconnect
+            return {"type": "http.request", "body": b"x", "more_body": received < 100}
+
+        async def app(scope, receive_, send):
+            await asyncio.sleep(0.01)
+            read_ahead.append(received)
+            while (await receive_())["more_body"]:
+                pass
+
+        scope = {"type": "http", "method": "POST", "path": "/"}
+        await asyncio.wait_for(DeadlineMiddleware(app)(scope, receive, lambda m: m), 1)
+        assert read_ahead[0] <= 2
+
+    # The path overrides apply from the start of the request
+    @pytest.mark.anyio
+    async def test_path_deadline(self, monkeypatch):
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 0.05)
+        middleware = DeadlineMiddleware(None, overrides={"/uploads": 120})
+        assert middleware.deadline("/uploads/") == 120
+        assert middleware.deadline("/users/") == 0.05
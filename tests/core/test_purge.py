@@ -0,0 +1,133 @@
+# tests/core/test_purge.py
+from datetime import timedelta
+
+import pytest
+from sqlmodel import select
+
+from apps.cms.models.navigation import Navigation, NavigationItem
+from apps.uploads.models import Upload
+from apps.users.models import User
+from apps.users.services import delete_user
+from core.models import ArchivedRow
+from core.purge import PurgeMode, purge
+from tests.conftest import TestingSessionLocal, engine
+from utils.time import current_time
+
+RETENTION = timedelta(days=30)
+
+
+def deleted_days_ago(days: int) -> dict:
+    return {"is_deleted": True, "deleted_at": current_time() - timedelta(days=days)}
+
+
+@pytest.fixture
+async def session(setup_database):
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+async def ids(session, model) -> set[str]:
+    session.expunge_all()
+    return set((await session.exec(select(model.id))).all())
+
+
+class TestPurge:
+    @pytest.mark.anyio
+    async def test_archives_expired_rows(self, session):
+        old = User(email="old@example.com", hashed_password="x", **deleted_days_ago(60))
+        recent = User(
+            email="new@example.com", hashed_password="x", **deleted_days_ago(1)
+        )
+        live = User(email="live@example.com", hashed_password="x")
+        session.add_all([old, recent, live])
+        await session.commit()
+
+        (stats,) = await purge(engine, RETENTION, tables=["user"], batch_size=1)
+        assert (stats.rows, stats.batches) == (1, 1)
+        assert await ids(session, User) == {recent.id, live.id}
+
+        archived = (await session.exec(select(ArchivedRow))).one()
+        assert (archived.table_name, archived.id) == ("user", old.id)
+        assert archived.data["email"] == "old@example.com"
+
+    # Rows soft deleted through the services carry their deletion time
+    @pytest.mark.anyio
+    async def test_purges_rows_deleted_by_service(self, session):
+        user = User(email="gone@example.com", hashed_password="x")
+        session.add(user)
+        await session.commit()
+        user_id = user.id
+        assert await delete_user(user_id, session)
+
+        (stats,) = await purge(engine, timedelta(0), tables=["user"])
+        assert stats.rows == 1
+        assert await ids(session, User) == set()
+
+    @pytest.mark.anyio
+    async def test_keeps_referenced_rows(self, session):
+        users = [
+            User(email=f"u{i}@example.com", hashed_password="x", **deleted_days_ago(60))
+            for i in range(2)
+        ]
+        session.add_all(users)
+        await session.commit()
+        # The upload of the first user is purged first, the second one is live
+        session.add_all(
+            [
+                Upload(
+                    file_name="a", url="a", owner_id=users[0].id, **deleted_days_ago(60)
+                ),
+                Upload(file_name="b", url="b", owner_id=users[1].id),
+            ]
+        )
+        await session.commit()
+
+        await purge(engine, RETENTION, mode=PurgeMode.DELETE)
+        assert await ids(session, User) == {users[1].id}
+        assert len(await ids(session, Upload)) == 1
+        assert await ids(session, ArchivedRow) == set()
+
+    @pytest.mark.anyio
+    async def test_self_referencing_rows(self, session):
+        navigation = Navigation(title="main", slug="main")
+        session.add(navigation)
+        await session.commit()
+        parent = NavigationItem(
+            title="p", slug="p", navigation_id=navigation.id, **deleted_days_ago(60)
+        )
+        session.add(parent)
+        await session.commit()
+        child = NavigationItem(
+            title="c", slug="c", navigation_id=navigation.id, parent_id=parent.id
+        )
+        session.add(child)
+        await session.commit()
+
+        await purge(engine, RETENTION, tables=["navigationitem"])
+        # The parent is still referenced by a live child
+        assert await ids(session, NavigationItem) == {parent.id, child.id}
+
+    # A parent is purged in the same run as its last child
+    @pytest.mark.anyio
+    async def test_parent_purged_after_children(self, session):
+        navigation = Navigation(title="main", slug="main")
+        session.add(navigation)
+        await session.commit()
+        parent = NavigationItem(
+            title="p", slug="p", navigation_id=navigation.id, **deleted_days_ago(60)
+        )
+        session.add(parent)
+        await session.commit()
+        child = NavigationItem(
+            title="c",
+            slug="c",
+            navigation_id=navigation.id,
+            parent_id=parent.id,
+            **deleted_days_ago(60),
+        )
+        session.add(child)
+        await session.commit()
+
+        (stats,) = await purge(engine, RETENTION, tables=["navigationitem"], pause=0)
+        assert (stats.rows, stats.batches) == (2, 2)
+        assert await ids(session, NavigationItem) == set()
@@ -0,0 +1,508 @@
+# tests/core/test_services.py
+import asyncio
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from apps.users.models import User
+from apps.users.services import UserService
+from core.database import DEFER_RELEASE, UNIT_OF_WORK, QueryStats, track_queries
+from core.pagination import InvalidCursorException
+from core.services import DeleteMode, InvalidFieldsException, TotalMode
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+async def session(setup_database):
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def user(session) -> User:
+    user = User(email="service@example.com", hashed_password="x")
+    session.add(user)
+    await session.commit()
+    return user
+
+
+class TestConnectionRelease:
+    # Reads end their transaction so the connection goes back to the pool
+    @pytest.mark.anyio
+    async def test_read_releases_connection(self, session, user):
+        service = UserService(session=session)
+        found = await service.get_by_id(user.id)
+        assert found.email == user.email
+        assert not session.in_transaction()
+
+    # Request sessions keep one transaction for all their reads
+    @pytest.mark.anyio
+    async def test_request_session_defers_release(self, session, user):
+        session.info[DEFER_RELEASE] = True
+        service = UserService(session=session)
+        connection = await session.connection()
+        await service.get_by_id(user.id)
+        await service.get_all()
+        assert session.in_transaction()
+        assert await session.connection() is connection
+
+    # Pending changes are never committed by a read
+    @pytest.mark.anyio
+    async def test_read_keeps_pending_writes(self, session, user):
+        service = UserService(session=session)
+        user_id = user.id
+        user.is_staff = True
+        session.add(user)
+        await session.flush()
+        await service.get_all()
+        assert session.in_transaction()
+        await session.rollback()
+        assert (await service.get_by_id(user_id)).is_staff is False
+
+
+class TestRowLookup:
+    @pytest.mark.anyio
+    async def test_get_row_by_id(self, session, user):
+        service = UserService(session=session)
+        row = await service.get_row_by_id(user.id)
+        assert row.email == user.email
+        assert not isinstance(row, User)
+        assert await service.get_row_by_id("missing") is None
+
+    @pytest.mark.anyio
+    async def test_get_user_row_by_email(self, session, user):
+        service = UserService(session=session)
+        row = await service.get_user_row_by_email(user.email)
+        assert row.id == user.id
+
+
+class TestUnitOfWork:
+    # Service writes are only flushed, the owner of the session commits once
+    @pytest.mark.anyio
+    async def test_writes_are_flushed_not_committed(self, session, user):
+        session.info[UNIT_OF_WORK] = True
+        service = UserService(session=session)
+        created = await service.create(
+            User(email="uow@example.com", hashed_password="x")
+        )
+        await service.update(user, {"is_staff": True})
+        assert session.in_transaction()
+        await session.rollback()
+        assert await service.get_row_by_id(created.id) is None
+
+    @pytest.mark.anyio
+    async def test_commit_once(self, session, user):
+        session.info[UNIT_OF_WORK] = True
+        service = UserService(session=session)
+        await service.update(user, {"is_staff": True})
+        await session.commit()
+        assert (await service.get_row_by_id(user.id)).is_staff is True
+
+
+class TestCursorPagination:
+    @pytest.fixture
+    async def users(self, session) -> list[User]:
+        users = [User(email=f"u{i}@example.com", hashed_password="x") for i in range(5)]
+        session.add_all(users)
+        await session.commit()
+        return sorted(users, key=lambda u: u.id)
+
+    @pytest.mark.anyio
+    async def test_pages_forward_and_back(self, session, users):
+        service = UserService(session=session)
+        first = await service.paginate_cursor(limit=2)
+        assert [u.id for u in first.items] == [u.id for u in users[:2]]
+        assert first.prev_cursor is None
+
+        second = await service.paginate_cursor(cursor=first.next_cursor, limit=2)
+        assert [u.id for u in second.items] == [u.id for u in users[2:4]]
+
+        last = await service.paginate_cursor(cursor=second.next_cursor, limit=2)
+        assert [u.id for u in last.items] == [users[4].id]
+        assert last.next_cursor is None
+
+        back = await service.paginate_cursor(cursor=last.prev_cursor, limit=2)
+        assert [u.id for u in back.items] == [u.id for u in users[2:4]]
+
+    @pytest.mark.anyio
+    async def test_invalid_cursor(self, session):
+        with pytest.raises(InvalidCursorException):
+            await UserService(session=session).paginate_cursor(cursor="%%%")
+
+
+class TestTotals:
+    @pytest.mark.anyio
+    async def test_estimated_falls_back_to_exact(self, session, user):
+        # Planner estimates are Postgres only
+        total = await UserService(session=session).count_total(mode=TotalMode.ESTIMATED)
+        assert total == (1, TotalMode.EXACT)
+
+    def test_reltuples_binds_table_name(self):
+        from sqlalchemy.dialects import postgresql
+        from core.services import RELTUPLES
+
+        compiled = RELTUPLES.compile(dialect=postgresql.asyncpg.dialect())
+        assert list(compiled.binds) == ["t"]
+        assert "CAST($1 AS regclass)" in str(compiled)
+
+    @pytest.mark.anyio
+    async def test_cached_until_write(self, session, user):
+        service = UserService(session=session)
+        assert await service.count_total(mode=TotalMode.CACHED) == (
+            1,
+            TotalMode.CACHED,
+        )
+
+        # Writes outside BaseService are not seen...
+        session.add(User(email="raw@example.com", hashed_password="x"))
+        await session.commit()
+        assert (await service.count_total(mode=TotalMode.CACHED)).value == 1
+
+        # ...writes through it invalidate the cached count
+        await service.create(User(email="new@example.com", hashed_password="x"))
+        assert (await service.count_total(mode=TotalMode.CACHED)).value == 3
+        assert (await service.count_total()).value == 3
+
+    @pytest.mark.anyio
+    async def test_paginate_with_total(self, session, user):
+        total, items = await UserService(session=session).paginate_with_total()
+        assert total == (1, TotalMode.EXACT)
+        assert [u.id for u in items] == [user.id]
+
+
+class TestBulkOperations:
+    @pytest.mark.anyio
+    async def test_bulk_create(self, session):
+        service = UserService(session=session)
+        ids = await service.bulk_create(
+            [
+                {"email": f"bulk{i}@example.com", "hashed_password": "x"}
+                for i in range(5)
+            ]
+            + [User(email="instance@example.com", hashed_password="x")],
+            batch_size=2,
+        )
+        assert len(ids) == len(set(ids)) == 6
+        assert not session.in_transaction()  # committed
+
+        users = await service.get_all()
+        assert sorted(u.id for u in users) == sorted(ids)
+        assert all(u.created_at is not None and not u.is_deleted for u in users)
+
+    @pytest.mark.anyio
+    async def test_bulk_update(self, session, user):
+        service = UserService(session=session)
+        other = await service.create(
+            User(email="other@example.com", hashed_password="x")
+        )
+        await service.bulk_update(
+            [{"id": user.id, "is_staff": True}, {"id": other.id, "is_verified": True}]
+        )
+        session.expunge_all()
+        assert (await service.get_by_id(user.id)).is_staff
+        assert (await service.get_by_id(other.id)).is_verified
+
+    @pytest.mark.anyio
+    async def test_bulk_soft_delete(self, session, user):
+        service = UserService(session=session)
+        ids = await service.bulk_create(
+            [{"email": f"del{i}@example.com", "hashed_password": "x"} for i in range(3)]
+        )
+        assert await service.bulk_delete(ids + [user.id], batch_size=2) == 4
+        # Already deleted rows are left alone
+        assert await service.bulk_delete(ids) == 0
+
+        session.expunge_all()
+        assert await service.get_by_id(ids[0]) is None
+        deleted = await service.including_deleted().get_by_id(ids[0])
+        assert deleted.is_deleted and deleted.deleted_at is not None
+
+    @pytest.mark.anyio
+    async def test_bulk_hard_delete(self, session, user):
+        service = UserService(session=session)
+        service.delete_mode = DeleteMode.HARD
+        assert await service.bulk_delete([user.id]) == 1
+        assert await service.count() == 0
+
+    @pytest.mark.anyio
+    async def test_bulk_writes_kept_in_unit_of_work(self, session):
+        session.info[UNIT_OF_WORK] = True
+        service = UserService(session=session)
+        await service.bulk_create(
+            [{"email": "uow@example.com", "hashed_password": "x"}]
+        )
+        # A read does not commit the bulk insert of the unit of work
+        assert await service.count() == 1
+        assert session.in_transaction()
+        await session.rollback()
+        assert await service.count() == 0
+
+
+class TestProjection:
+    @pytest.mark.anyio
+    async def test_load_only(self, session, user):
+        session.expunge_all()
+        service = UserService(session=session)
+        (found,) = await service.get_all(fields=["email"])
+        assert (found.id, found.email) == (user.id, user.email)
+        # Columns left out raise instead of lazy loading
+        with pytest.raises(InvalidRequestError):
+            found.hashed_password
+
+    @pytest.mark.anyio
+    async def test_unknown_fields(self, session):
+        with pytest.raises(InvalidFieldsException):
+            UserService(session=session).project(fields=["nope"])
+
+
+class TestStream:
+    @pytest.mark.anyio
+    async def test_stream_in_chunks(self, session, user):
+        service = UserService(session=session)
+        await service.bulk_create(
+            [{"email": f"s{i}@example.com", "hashed_password": "x"} for i in range(4)]
+        )
+        streamed = [u.id async for u in service.stream(chunk_size=2)]
+        # The connection is released at the end of the stream
+        assert not session.in_transaction()
+        assert sorted(streamed) == sorted(u.id for u in await service.get_all())
+
+
+class TestUpsert:
+    @pytest.mark.anyio
+    async def test_upsert(self, session, user):
+        service = UserService(session=session)
+        updated = await service.upsert(
+            {"email": user.email, "hashed_password": "new", "is_staff": True},
+            conflict_on=["email"],
+        )
+        assert (updated.id, updated.hashed_password) == (user.id, "new")
+        assert updated.is_staff and updated.created_at == user.created_at
+
+        inserted = await service.upsert(
+            {"email": "upsert@example.com", "hashed_password": "x"},
+            conflict_on=["email"],
+        )
+        assert inserted.id != user.id
+        assert await service.count() == 2
+
+    @pytest.mark.anyio
+    async def test_partial_upsert_keeps_other_columns(self, session, user):
+        service = UserService(session=session)
+        await service.update(user, {"is_staff": True, "is_active": False})
+        email, created_at = user.email, user.created_at
+        updated = await service.upsert(
+            {"email": email, "hashed_password": "new"}, conflict_on=["email"]
+        )
+        session.expunge_all()
+        row = await service.including_deleted().get_row_by_id(updated.id)
+        assert row.hashed_password == "new"
+        # Not given, not reset to the model defaults
+        assert (row.is_staff, row.is_active) == (True, False)
+        assert row.created_at.replace(tzinfo=None) == created_at.replace(tzinfo=None)
+
+    @pytest.mark.anyio
+    async def test_bulk_upsert_keeps_other_columns(self, session, user):
+        service = UserService(session=session)
+        await service.update(user, {"is_staff": True})
+        await service.bulk_upsert(
+            [{"email": user.email, "hashed_password": "new"}], conflict_on=["email"]
+        )
+        session.expunge_all()
+        row = await service.get_row_by_id(user.id)
+        assert (row.hashed_password, row.is_staff) == ("new", True)
+
+    # A conflict on a soft deleted row restores it
+    @pytest.mark.anyio
+    async def test_upsert_restores_deleted_row(self, session, user):
+        service = UserService(session=session)
+        await service.delete(user)
+        restored = await service.upsert(
+            {"email": user.email, "hashed_password": "new"}, conflict_on=["email"]
+        )
+        assert restored.id == user.id
+        assert not restored.is_deleted and restored.deleted_at is None
+        session.expunge_all()
+        assert (await service.get_by_id(user.id)).hashed_password == "new"
+
+    @pytest.mark.anyio
+    async def test_upsert_do_nothing(self, session, user):
+        service = UserService(session=session)
+        skipped = await service.upsert(
+            {"email": user.email, "hashed_password": "new"},
+            conflict_on=["email"],
+            update=[],
+        )
+        assert skipped is None
+        session.expunge_all()
+        assert (await service.get_by_id(user.id)).hashed_password == "x"
+
+    @pytest.mark.anyio
+    async def test_bulk_upsert(self, session, user):
+        service = UserService(session=session)
+        await service.bulk_upsert(
+            [
+                {"email": user.email, "hashed_password": "new"},
+                {"email": "bulk@example.com", "hashed_password": "x"},
+            ],
+            conflict_on=["email"],
+            update=["hashed_password"],
+        )
+        session.expunge_all()
+        users = {u.email: u for u in await service.get_all()}
+        assert users[user.email].hashed_password == "new"
+        assert users[user.email].id == user.id
+        assert "bulk@example.com" in users
+
+
+class TestIdentityCache:
+    @pytest.mark.anyio
+    async def test_get_by_id_served_from_cache(self, session, user):
+        service = UserService(session=session)
+        # Instances already in the session are returned without the cache
+        session.expunge_all()
+        await service.get_by_id(user.id)
+        session.expunge_all()
+
+        with track_queries(QueryStats()) as stats:
+            cached = await service.get_by_id(user.id)
+        assert stats.count == 0
+        assert cached.email == user.email and cached in session
+        assert service.identity_cache.stats()["hits"] == 1
+
+    @pytest.mark.anyio
+    async def test_unique_filter_by(self, session, user):
+        service = UserService(session=session)
+        await service.filter_by(email=user.email)
+        session.expunge_all()
+        with track_queries(QueryStats()) as stats:
+            (cached,) = await service.filter_by(email=user.email)
+        assert stats.count == 0 and cached.id == user.id
+
+    @pytest.mark.anyio
+    async def test_evicted_on_write(self, session, user):
+        service = UserService(session=session)
+        email = user.email
+        await service.filter_by(email=email)
+        await service.update_by_id(user.id, {"email": "changed@example.com"})
+        session.expunge_all()
+
+        assert await service.filter_by(email=email) == []
+        assert (await service.get_by_id(user.id)).email == "changed@example.com"
+
+        await service.delete_by_id(user.id)
+        session.expunge_all()
+        assert await service.get_by_id(user.id) is None
+
+    # The instance of the session wins over the cache, with its unflushed changes
+    @pytest.mark.anyio
+    async def test_live_instance_not_overwritten(self, session, user):
+        service = UserService(session=session)
+        found = await service.get_by_id(user.id)
+        found.email = "changed@example.com"
+        again = await service.get_by_id(user.id)
+        assert again is found
+        assert again.email == "changed@example.com"
+
+    @pytest.mark.anyio
+    async def test_uncommitted_writes_not_cached(self, session, user):
+        session.info[UNIT_OF_WORK] = True
+        service = UserService(session=session)
+        user_id = user.id
+        await service.update(user, {"is_staff": True})
+        # Read back in the same transaction, the flushed values are not cached
+        assert (await service.get_by_id(user_id)).is_staff is True
+        assert ("id", user_id) not in service.identity_cache
+        await session.rollback()
+
+        async with TestingSessionLocal() as other:
+            found = await UserService(session=other).get_by_id(user_id)
+            assert found.is_staff is False
+
+    @pytest.mark.anyio
+    async def test_evicted_again_on_commit(self, session, user):
+        session.info[UNIT_OF_WORK] = True
+        service = UserService(session=session)
+        user_id = user.id
+        await service.update(user, {"is_staff": True})
+        # Another session caches the committed (old) row before the commit
+        service.identity_cache.set(("id", user_id), {"id": user_id})
+        await session.commit()
+        assert ("id", user_id) not in service.identity_cache
+
+    @pytest.mark.anyio
+    async def test_snapshot_is_not_shared(self, session, user):
+        service = UserService(session=session)
+        email = user.email
+        found = await service.get_by_id(user.id)
+        found.email = "unsaved@example.com"
+        session.expunge_all()
+        assert (await service.get_by_id(user.id)).email == email
+
+
+class TestBatchLoader:
+    @pytest.fixture
+    async def ids(self, session) -> list[str]:
+        return await UserService(session=session).bulk_create(
+            [
+                {"email": f"load{i}@example.com", "hashed_password": "x"}
+                for i in range(3)
+            ]
+        )
+
+    @pytest.mark.anyio
+    async def test_one_query_per_batch(self, session, ids):
+        service = UserService(session=session)
+        with track_queries(QueryStats()) as stats:
+            users = await service.load_many([*ids, "missing"])
+        assert stats.count == 1
+        assert [u.id for u in users[:3]] == ids and users[3] is None
+
+        # Memoized for the session, other services share the loader
+        with track_queries(QueryStats()) as stats:
+            assert (await UserService(session=session).load(ids[0])).id == ids[0]
+        assert stats.count == 0
+
+    # Loaders of one session wait for each other's queries
+    @pytest.mark.anyio
+    async def test_loaders_share_the_session(self, session, ids):
+        service = UserService(session=session)
+        users, all_users = await asyncio.gather(
+            service.load_many(ids), service.including_deleted().load_many(ids)
+        )
+        assert [u.id for u in users] == [u.id for u in all_users] == ids
+
+    @pytest.mark.anyio
+    async def test_evicted_on_write(self, session, ids):
+        service = UserService(session=session)
+        user = await service.load(ids[0])
+        await service.update(user, {"is_staff": True})
+        session.expunge_all()
+        assert (await service.load(ids[0])).is_staff
+
+
+class TestSoftDeleteScoping:
+    @pytest.fixture
+    async def deleted(self, session) -> User:
+        deleted = User(email="gone@example.com", hashed_password="x", is_deleted=True)
+        session.add(deleted)
+        await session.commit()
+        return deleted
+
+    @pytest.mark.anyio
+    async def test_deleted_rows_left_out(self, session, user, deleted):
+        service = UserService(session=session)
+        assert await service.get_by_id(deleted.id) is None
+        assert await service.get_row_by("email", deleted.email) is None
+        assert await service.filter_by(email=deleted.email) == []
+        assert [u.id for u in await service.get_all()] == [user.id]
+        assert await service.count() == 1
+        assert (await service.count_total(mode=TotalMode.CACHED)).value == 1
+        assert not await service.exists(email=deleted.email)
+
+    @pytest.mark.anyio
+    async def test_including_deleted(self, session, user, deleted):
+        service = UserService(session=session).including_deleted()
+        assert (await service.get_by_id(deleted.id)).id == deleted.id
+        assert (await service.get_row_by("email", deleted.email)).id == deleted.id
+        assert await service.count() == 2
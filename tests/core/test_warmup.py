@@ -0,0 +1,46 @@
+# tests/core/test_warmup.py
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.warmup import prime_statements, retry_warm_up, warm_up_pool
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.mark.anyio
+async def test_warm_up_pool():
+    engine = create_async_engine("sqlite+aiosqlite:///file::memory:?uri=true")
+    await warm_up_pool(engine, connections=3)
+    # The connections were opened at the same time and kept by the pool
+    assert engine.pool.checkedin() == 3
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_prime_statements(setup_database):
+    await prime_statements(TestingSessionLocal)
+
+
+@pytest.mark.anyio
+async def test_retry_warm_up(monkeypatch):
+    from types import SimpleNamespace
+
+    attempts = []
+
+    async def flaky_warm_up(app):
+        attempts.append(app)
+        if len(attempts) < 3:
+            raise ConnectionError("database is down")
+
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("core.warmup.warm_up", flaky_warm_up)
+    monkeypatch.setattr("core.warmup.asyncio.sleep", sleep)
+    app = SimpleNamespace(state=SimpleNamespace(ready=False))
+    await retry_warm_up(app, delay=1, max_delay=3)
+    # Ready after the third attempt, with a capped exponential backoff
+    assert app.state.ready is True
+    assert len(attempts) == 3
+    assert delays == [1, 2, 3]
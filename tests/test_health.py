@@ -8,3 +8,22 @@ import pytest
 async def test_health(client):
     response = await client.get("/health")
     assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_health_details(client):
+    response = await client.get("/health/details")
+    assert response.status_code == 200
+    data = response.json()["metrics"]
+    assert "db.pool.checked_out" in data["gauges"]
+
+
+@pytest.mark.anyio
+async def test_readiness(client, app, monkeypatch):
+    monkeypatch.setattr(app.state, "ready", False, raising=False)
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+
+    monkeypatch.setattr(app.state, "ready", True)
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
@@ -0,0 +1 @@
+# tests/uploads/__init__.py
@@ -0,0 +1,37 @@
+# tests/uploads/test_endpoints.py
+
+import pytest
+from httpx import AsyncClient
+
+from apps.uploads.models import Upload
+from apps.users.models import User
+from core import config
+from tests.conftest import save_to_db
+
+
+class TestListUploads:
+    # Staff listings resolve the owners with one query, whatever their number
+    @pytest.mark.anyio
+    async def test_list_resolves_owners(
+        self,
+        client: AsyncClient,
+        create_staff_user,
+        get_token_pair_for_user,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(config.get_settings(), "DEBUG", True)
+        for i in range(3):
+            owner = User(email=f"owner{i}@example.com", hashed_password="x")
+            await save_to_db(owner)
+            await save_to_db(
+                Upload(file_name=f"f{i}.txt", url=f"/f{i}.txt", owner_id=owner.id)
+            )
+        token_pair = await get_token_pair_for_user(create_staff_user)
+        response = await client.get(
+            "/uploads/", headers={"Authorization": f"Bearer {token_pair.access_token}"}
+        )
+        assert response.status_code == 200
+        owners = sorted(upload["owner"]["email"] for upload in response.json())
+        assert owners == [f"owner{i}@example.com" for i in range(3)]
+        # the uploads and their owners
+        assert response.headers["X-DB-Queries"] == "2"
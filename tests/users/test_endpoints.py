@@ -0,0 +1,65 @@
+# tests/users/test_endpoints.py
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from apps.users.models import User
+from apps.users.services import UserService
+from core import config
+from tests.conftest import save_to_db
+
+
+class TestListUsers:
+    # Test the NDJSON streaming of the user list
+    @pytest.mark.anyio
+    async def test_stream_ndjson(
+        self, client: AsyncClient, create_staff_user, get_token_pair_for_user
+    ):
+        for i in range(3):
+            await save_to_db(User(email=f"user{i}@example.com", hashed_password="x"))
+        token_pair = await get_token_pair_for_user(create_staff_user)
+        response = await client.get(
+            "/users/",
+            headers={
+                "Authorization": f"Bearer {token_pair.access_token}",
+                "Accept": "application/x-ndjson",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        users = [json.loads(line) for line in response.text.splitlines()]
+        assert len(users) == 4
+        assert "hashed_password" not in users[0]
+
+    # The stream is not cut off by the request deadline
+    @pytest.mark.anyio
+    async def test_stream_outlives_request_deadline(
+        self,
+        client: AsyncClient,
+        create_staff_user,
+        get_token_pair_for_user,
+        monkeypatch,
+    ):
+        stream = UserService.stream
+
+        async def slow_stream(self, *args, **kwargs):
+            async for item in stream(self, *args, **kwargs):
+                await asyncio.sleep(0.05)
+                yield item
+
+        monkeypatch.setattr(UserService, "stream", slow_stream)
+        monkeypatch.setattr(config.get_settings(), "REQUEST_DEADLINE", 0.1)
+        for i in range(3):
+            await save_to_db(User(email=f"user{i}@example.com", hashed_password="x"))
+        token_pair = await get_token_pair_for_user(create_staff_user)
+        response = await client.get(
+            "/users/",
+            headers={
+                "Authorization": f"Bearer {token_pair.access_token}",
+                "Accept": "application/x-ndjson",
+            },
+        )
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 4